@@ -0,0 +1,269 @@
+# Adminpagina. Pas geïmporteerd na een geslaagde adminlogin, zodat pandas, matplotlib en
+# openpyxl niet geladen worden in de chauffeurssessies.
+import json
+
+import pandas as pd
+import streamlit as st
+
+from analyse import analyse_voorkeuren
+from bronnen import (
+    alle_medewerkers, cache_statistiek, herlaad_inzendingen, lokale_opslag, ververs_personeel,
+)
+from catalogus import CATALOGUS
+from dashboard import DashboardStand
+from export import EXCEL_MIME, excel_per_dienst
+from grafiek import toon_populairste
+from sheetdb import latentie_statistiek
+from toewijzing import ancienniteit_tabel, bereken_toewijzing, voorkeuren_per_chauffeur
+from voorkeuren import vingerafdruk
+
+# Overzicht per dienst
+DIENSTEN_PER_PAGINA = 6
+TYPE_LABELS = {"tram": "🚋 Tram", "bus": "🚌 Bus", "gemengd": "🔀 Gemengd", "overige": "❔ Overige"}
+
+
+def toon_adminpagina(meting, opslag_pad, sheetdb_url, google_sheet_url):
+    st.markdown("<h1 style='color: #DAA520;'>🔐 Adminoverzicht: Dienstvoorkeuren</h1>", unsafe_allow_html=True)
+
+    # ========== Cache ==========
+    st.sidebar.header("🗄️ Cache")
+    # De pagina leest de lokale opslag; wijzigingen rechtstreeks in SheetDB komen pas binnen via deze knop
+    if st.sidebar.button("🔄 Gegevens nu verversen"):
+        ververs_personeel()
+        try:
+            opslag, _ = lokale_opslag(opslag_pad, sheetdb_url)
+            telling = herlaad_inzendingen(opslag, sheetdb_url)
+            # Wijzigingen in de sheet hoeven "Laatste aanpassing" niet te raken: volledig herberekenen
+            st.session_state.pop("dashboard_stand", None)
+            st.sidebar.caption(f"SheetDB ingelezen: {telling['ingelezen']} rijen, {telling['verwijderd']} verwijderd")
+        except Exception as e:
+            st.sidebar.error(f"❌ Verversen mislukt: {e}")
+    for bron, stat in cache_statistiek().items():
+        st.sidebar.caption(f"{bron}: {stat['hits']} hits / {stat['misses']} misses")
+    for endpoint, stat in latentie_statistiek().items():
+        st.sidebar.caption(
+            f"{endpoint}: {stat['aantal']}× · gem. {stat['gemiddeld_ms']:.0f} ms · "
+            f"max {stat['max_ms']:.0f} ms · {stat['fouten']} fouten"
+        )
+
+    try:
+        meting.begin("fetch")
+        opslag, _ = lokale_opslag(opslag_pad, sheetdb_url)
+        sync = opslag.sync_status()
+        st.sidebar.caption(f"SheetDB-sync: {sync['wachtend']} wachtend, {sync['met_fout']} met fout")
+        if sync["laatste_fout"]:
+            st.sidebar.caption(f"Laatste syncfout: {sync['laatste_fout']}")
+
+        inzendingen = opslag.alle()
+        meting.noteer(rijen=len(inzendingen), bytes=len(json.dumps(inzendingen, ensure_ascii=False).encode()))
+
+        if not inzendingen:
+            st.info("Er zijn nog geen inzendingen.")
+            return
+
+        # Enkel nieuwe/gewijzigde/verwijderde inzendingen verwerken t.o.v. de vorige weergave
+        meting.begin("parse")
+        stand = st.session_state.setdefault("dashboard_stand", DashboardStand())
+        try:
+            delta = stand.bijwerken(inzendingen)
+        except Exception:
+            st.session_state.pop("dashboard_stand", None)
+            raise
+        if delta and not delta.volledig:
+            st.sidebar.caption(
+                f"Bijgewerkt: {len(delta.nieuw)} nieuw, {len(delta.gewijzigd)} gewijzigd, "
+                f"{len(delta.verwijderd)} verwijderd"
+            )
+
+        df = stand.df
+        voorkeuren_lang = stand.lang
+        rijen_per_dienst = stand.rijen_per_dienst
+        diensten_uniek = stand.diensten
+        meting.noteer(
+            rijen=len(df), voorkeuren=len(voorkeuren_lang),
+            verwerkt="volledig" if delta.volledig else ("delta" if delta else "ongewijzigd"),
+        )
+
+        # ========== Filters ==========
+        st.sidebar.header("🔎 Filters")
+        zoeknummer = st.sidebar.text_input("Zoek op personeelsnummer")
+
+        if not diensten_uniek:
+            st.warning("⚠️ Geen unieke diensten gevonden in de data.")
+            return
+
+        gekozen_diensten = st.sidebar.multiselect("Filter op dienst", diensten_uniek)
+
+        meting.begin("filter")
+        df_filtered = df.copy()
+        if zoeknummer:
+            df_filtered = df_filtered[df_filtered["Personeelsnummer"].str.contains(zoeknummer.strip(), na=False)]
+        if gekozen_diensten:
+            gekozen_rijen = set().union(*(rijen_per_dienst[d] for d in gekozen_diensten))
+            df_filtered = df_filtered[df_filtered.index.isin(gekozen_rijen)]
+        meting.noteer(rijen=len(df_filtered))
+
+        meting.begin("render", onderdeel="overzicht")
+        st.subheader("📋 Overzicht van inzendingen")
+        st.dataframe(df_filtered.sort_values("Ingevuld op", ascending=False), use_container_width=True, hide_index=True)
+
+        # ========== Populairste diensten ==========
+        meting.begin("render", onderdeel="grafiek")
+        st.subheader("📊 Populairste voorkeuren")
+        toon_populairste(stand.telling_reeks)
+
+        # ========== Vraag en overinschrijving ==========
+        meting.begin("aggregate", onderdeel="analyse")
+        analyse = analyse_voorkeuren(
+            vingerafdruk(voorkeuren_lang[["Personeelsnummer", "dienst", "rang"]]), voorkeuren_lang
+        )
+        meting.noteer(diensten=len(analyse.per_dienst))
+
+        meting.begin("render", onderdeel="analyse")
+        st.subheader("📈 Vraag en overinschrijving")
+        overvraagd = int((analyse.per_dienst["overinschrijving"] > 1).sum())
+        st.caption(
+            f"{overvraagd} diensten met meer kandidaten dan plaatsen. Gewogen vraag telt een voorkeur "
+            "op rang r als 1/r; plaatsen komen uit capaciteit.csv (standaard 1 per dienst)."
+        )
+        tab_dienst, tab_rooster, tab_groep, tab_rang = st.tabs(["Per dienst", "Per rooster", "Per groep", "Rangverdeling"])
+        with tab_dienst:
+            st.dataframe(analyse.per_dienst.round(2), use_container_width=True)
+        with tab_rooster:
+            st.dataframe(analyse.per_rooster.round(2), use_container_width=True)
+        with tab_groep:
+            st.dataframe(analyse.per_groep.round(2), use_container_width=True)
+        with tab_rang:
+            st.dataframe(analyse.rangverdeling, use_container_width=True)
+
+        # ========== Overzicht per dienst ==========
+        meting.begin("aggregate", onderdeel="per dienst")
+        st.subheader("👥 Overzicht per dienst")
+
+        tabellen_per_dienst = {d: stand.tabellen[d] for d in diensten_uniek if d in stand.tabellen}
+
+        # Enkel de diensten van de gekozen groep en pagina worden opgebouwd en naar de browser gestuurd
+        if gekozen_diensten:
+            te_tonen = gekozen_diensten
+            st.caption("Gefilterd op de gekozen diensten in de zijbalk.")
+        else:
+            indeling = stand.indeling()
+            kol1, kol2 = st.columns(2)
+            with kol1:
+                type_ = st.radio(
+                    "Voertuigtype", [t for t in TYPE_LABELS if t in indeling],
+                    format_func=TYPE_LABELS.get, horizontal=True, key="overzicht_type"
+                )
+            with kol2:
+                rooster = st.selectbox(
+                    "Rooster", ["Alle roosters"] + sorted(indeling[type_]), key=f"overzicht_rooster_{type_}"
+                )
+            te_tonen = [
+                d for code, diensten_code in sorted(indeling[type_].items())
+                if rooster in ("Alle roosters", code) for d in diensten_code
+            ]
+
+        meting.noteer(diensten=len(te_tonen))
+
+        meting.begin("render", onderdeel="per dienst")
+        aantal_paginas = max(1, -(-len(te_tonen) // DIENSTEN_PER_PAGINA))
+        if st.session_state.get("overzicht_pagina", 1) > aantal_paginas:
+            st.session_state["overzicht_pagina"] = 1
+        pagina = 1
+        if aantal_paginas > 1:
+            pagina = st.number_input(f"Pagina (van {aantal_paginas})", 1, aantal_paginas, key="overzicht_pagina")
+
+        begin = (pagina - 1) * DIENSTEN_PER_PAGINA
+        for dienst in te_tonen[begin:begin + DIENSTEN_PER_PAGINA]:
+            tabel = tabellen_per_dienst.get(dienst)
+            with st.expander(f"🚌 {dienst} ({0 if tabel is None else len(tabel)})", expanded=True):
+                if tabel is None:
+                    st.info("⚠️ Geen geldige inschrijvingen gevonden.")
+                else:
+                    st.dataframe(tabel, use_container_width=True)
+
+        meting.begin("export")
+        if tabellen_per_dienst:
+            # Werkboek enkel op vraag aanmaken; per versie van de inzendingen gememoiseerd
+            excel_versie = vingerafdruk(voorkeuren_lang[["Personeelsnummer", "Naam", "dienst"]])
+            if st.button("📄 Maak Excel-overzicht per dienst") or st.session_state.get("excel_versie") == excel_versie:
+                st.session_state["excel_versie"] = excel_versie
+                werkboek = excel_per_dienst(excel_versie, tabellen_per_dienst)
+                meting.noteer(werkbladen=len(tabellen_per_dienst), bytes=len(werkboek))
+                st.download_button(
+                    label="📥 Download Excel-overzicht per dienst",
+                    data=werkboek,
+                    file_name="Overzicht_per_dienst.xlsx",
+                    mime=EXCEL_MIME
+                )
+        else:
+            st.warning("⚠️ Er werden geen werkbladen aangemaakt. Geen geldige voorkeuren gevonden.")
+
+        # ========== Toewijzing open plaatsen ==========
+        st.subheader("🎯 Toewijzing open plaatsen")
+        with st.form("toewijzing"):
+            # Tabel i.p.v. multiselect: één dienst kan meerdere open plaatsen hebben
+            open_tabel = st.data_editor(
+                pd.DataFrame({"Dienst": pd.Series(dtype="str"), "Aantal": pd.Series(dtype="int64")}),
+                num_rows="dynamic",
+                column_config={
+                    "Dienst": st.column_config.SelectboxColumn(
+                        "Open plaats", options=[d.naam for d in CATALOGUS.diensten], required=True
+                    ),
+                    "Aantal": st.column_config.NumberColumn("Aantal", min_value=1, step=1, default=1, required=True),
+                },
+                hide_index=True,
+                use_container_width=True,
+                key="open_plaatsen",
+            )
+            berekenen = st.form_submit_button("Bereken toewijzing volgens stelplaatsanciënniteit")
+
+        open_tabel = open_tabel.dropna(subset=["Dienst"])
+        open_plaatsen = open_tabel["Dienst"].repeat(open_tabel["Aantal"].fillna(1).astype(int).clip(lower=0)).tolist()
+
+        if berekenen and open_plaatsen:
+            meting.begin("aggregate", onderdeel="toewijzing")
+            medewerkers = alle_medewerkers(google_sheet_url)
+            try:
+                ancienniteit = ancienniteit_tabel({n: m.ancienniteit for n, m in medewerkers.items()})
+            except ValueError as e:
+                st.warning(f"⚠️ {e}")
+            else:
+                if not ancienniteit:
+                    st.warning("⚠️ Geen stelplaatsanciënniteit gevonden in de personeelslijst.")
+                else:
+                    huidige_plaatsen = {n: m.huidige_dienst for n, m in medewerkers.items() if m.huidige_dienst}
+                    resultaat = bereken_toewijzing(
+                        open_plaatsen, voorkeuren_per_chauffeur(voorkeuren_lang), ancienniteit, huidige_plaatsen
+                    )
+                    if resultaat.toewijzingen:
+                        # Wie meermaals doorschuift (A -> B -> C) telt enkel met zijn eindplaats
+                        laatste = {t.personeelsnummer: t for t in resultaat.toewijzingen}
+                        st.dataframe([
+                            {
+                                "Plaats": plaats,
+                                "Personeelsnummer": nummer,
+                                "Naam": getattr(medewerkers.get(nummer), "naam", ""),
+                                "Voorkeur": laatste[nummer].rang,
+                                "Huidige plaats": huidige_plaatsen.get(nummer, ""),
+                                "Doorgeschoven": "🔄" if laatste[nummer].doorgeschoven else "",
+                            }
+                            for nummer, plaats in ((n, resultaat.eindplaatsen[n]) for n in laatste)
+                        ], use_container_width=True, hide_index=True)
+                        with st.expander("Verloop van de cascade"):
+                            st.dataframe([
+                                {
+                                    "Stap": i,
+                                    "Plaats": t.dienst,
+                                    "Personeelsnummer": t.personeelsnummer,
+                                    "Voorkeur": t.rang,
+                                    "Vorige plaats": t.vorige_plaats or "",
+                                    "Later vervangen": "↪️" if laatste[t.personeelsnummer] is not t else "",
+                                }
+                                for i, t in enumerate(resultaat.toewijzingen, start=1)
+                            ], use_container_width=True, hide_index=True)
+                    if resultaat.onvervuld:
+                        st.warning(f"⚠️ Geen kandidaat voor: {', '.join(resultaat.onvervuld)}")
+
+    except Exception as e:
+        st.error(f"❌ Fout bij ophalen of verwerken gegevens: {e}")
@@ -0,0 +1,110 @@
+import csv
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from catalogus import CATALOGUS, groep_label
+
+CAPACITEIT_CSV = Path(__file__).with_name("capaciteit.csv")
+# Elke dienst is standaard één plaats, zoals bij de toewijzing van open plaatsen
+STANDAARD_PLAATSEN = 1
+
+
+class Analyse(NamedTuple):
+    per_dienst: pd.DataFrame      # index dienst
+    per_rooster: pd.DataFrame     # index roostercode
+    per_groep: pd.DataFrame       # index (type, groep)
+    rangverdeling: pd.DataFrame   # dienst x rang -> aantal chauffeurs
+
+
+# ====== Capaciteit ======
+def laad_capaciteit(pad=CAPACITEIT_CSV, catalogus=CATALOGUS):
+    # capaciteit.csv: code,groep,plaatsen. Een lege groep geldt voor alle groepen van dat rooster;
+    # een rij met groep gaat daar boven. Diensten zonder rij houden STANDAARD_PLAATSEN.
+    plaatsen = {d.naam: STANDAARD_PLAATSEN for d in catalogus.diensten}
+    if not Path(pad).exists():
+        return plaatsen
+    with open(pad, newline="", encoding="utf-8") as f:
+        rijen = list(csv.DictReader(f))
+    per_code = {r["code"].strip(): int(r["plaatsen"]) for r in rijen if not (r.get("groep") or "").strip()}
+    per_groep = {
+        (r["code"].strip(), int(r["groep"])): int(r["plaatsen"])
+        for r in rijen if (r.get("groep") or "").strip()
+    }
+    for d in catalogus.diensten:
+        plaatsen[d.naam] = per_groep.get((d.code, d.groep), per_code.get(d.code, plaatsen[d.naam]))
+    return plaatsen
+
+
+CAPACITEIT = laad_capaciteit()
+
+
+# ====== Analyse ======
+def _kenmerken(catalogus):
+    # dienst -> code, type, groep als kolommen, voor groupby per rooster en per groep
+    return pd.DataFrame(
+        {
+            "code": [d.code for d in catalogus.diensten],
+            "type": [d.type for d in catalogus.diensten],
+            "groep": [groep_label(d.groep) for d in catalogus.diensten],
+        },
+        index=pd.Index([d.naam for d in catalogus.diensten], name="dienst"),
+    )
+
+
+def _samenvatting(lang, sleutels):
+    return lang.groupby(sleutels, sort=False).agg(
+        chauffeurs=("Personeelsnummer", "nunique"),
+        eerste_keuze=("eerste", "sum"),
+        gewogen_vraag=("gewicht", "sum"),
+        gemiddelde_rang=("rang", "mean"),
+    )
+
+
+def _met_plaatsen(samen, plaatsen):
+    samen = samen.join(plaatsen, how="outer")
+    samen[["chauffeurs", "eerste_keuze", "gewogen_vraag"]] = samen[["chauffeurs", "eerste_keuze", "gewogen_vraag"]].fillna(0)
+    # Overinschrijving: chauffeurs per beschikbare plaats (> 1 = meer vraag dan plaatsen)
+    samen["overinschrijving"] = samen["chauffeurs"] / samen["plaatsen"].replace(0, np.nan)
+    return samen.astype({"chauffeurs": "int64", "eerste_keuze": "int64"})
+
+
+def analyseer(lang, capaciteit=CAPACITEIT, catalogus=CATALOGUS):
+    # lang: één rij per (chauffeur, dienst) met rang, zie voorkeuren.explodeer_voorkeuren.
+    # Gewogen vraag telt een voorkeur op rang r als 1/r: een eerste keuze weegt het zwaarst.
+    kenmerken = _kenmerken(catalogus)
+    rang = lang["rang"].to_numpy()
+    werk = pd.DataFrame({
+        "Personeelsnummer": lang["Personeelsnummer"].to_numpy(),
+        "dienst": lang["dienst"].to_numpy(),
+        "rang": rang,
+        "eerste": rang == 1,
+        "gewicht": 1.0 / rang,
+    })
+    werk = werk.join(kenmerken, on="dienst")
+
+    plaatsen = pd.Series(capaciteit, name="plaatsen", dtype="float64").rename_axis("dienst")
+    per_dienst = _met_plaatsen(_samenvatting(werk, "dienst"), plaatsen)
+    per_dienst = per_dienst.join(kenmerken).sort_values(
+        ["overinschrijving", "gewogen_vraag"], ascending=False, na_position="last"
+    )
+
+    plaatsen_kenmerken = kenmerken.join(plaatsen)
+    per_rooster = _met_plaatsen(
+        _samenvatting(werk, "code"), plaatsen_kenmerken.groupby("code")["plaatsen"].sum()
+    ).sort_values("gewogen_vraag", ascending=False)
+    per_groep = _met_plaatsen(
+        _samenvatting(werk, ["type", "groep"]), plaatsen_kenmerken.groupby(["type", "groep"])["plaatsen"].sum()
+    ).sort_index()
+
+    rangverdeling = pd.crosstab(werk["dienst"], werk["rang"]).reindex(per_dienst.index, fill_value=0)
+    return Analyse(per_dienst, per_rooster, per_groep, rangverdeling)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def analyse_voorkeuren(vingerafdruk, _lang):
+    # Enkel de vingerafdruk is de cachesleutel, zoals bij het Excel-overzicht
+    return analyseer(_lang)
@@ -0,0 +1,246 @@
+"""Offline benchmark en loadtest van de app via Streamlit's AppTest.
+
+Start een nepserver voor SheetDB en de personeels-CSV (nep_server.py), vult die met een
+synthetische dataset (dataset.py) en speelt de admin- en gebruikersflow headless af.
+Per stap wordt de rerun-latentie gemeten, per scenario het geheugenpiek (tracemalloc) en
+het aantal upstream-oproepen per endpoint.
+
+    python benchmarks/bench_app.py --bewaar-baseline            # baseline vastleggen
+    python benchmarks/bench_app.py --vergelijk                  # faalt (exit 1) bij regressie
+    python benchmarks/bench_app.py --latentie-ms 150 --foutkans 0.05
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+HIER = Path(__file__).resolve().parent
+ROOT = HIER.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(HIER))
+
+import streamlit as st  # noqa: E402
+from streamlit import config as st_config  # noqa: E402
+from streamlit import logger as st_logger  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# Stil houden: AppTest en de caches buiten een runtime loggen anders per rerun waarschuwingen
+st_config.set_option("logger.level", "error")
+st_logger.set_log_level("error")
+
+import bronnen  # noqa: E402
+from dataset import controle_code, maak_dataset  # noqa: E402
+from nep_server import NepServer  # noqa: E402
+
+APP = ROOT / "app_diensten.py.py"
+BASELINE = HIER / "baseline.json"
+WACHTWOORD = "benchmark"
+
+
+# ====== Hulpfuncties ======
+def _widget(widgets, label):
+    for w in widgets:
+        if w.label == label:
+            return w
+    raise LookupError(f"widget '{label}' niet gevonden")
+
+
+def _controleer(at, stap):
+    if at.exception:
+        raise RuntimeError(f"{stap}: {at.exception[0].value}")
+
+
+def _koud():
+    # Elke herhaling start zoals een vers proces: geen data- of resourcecache, geen personeelsindex
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    bronnen.ververs_personeel()
+
+
+def _nieuwe_app(server, opslag_pad, timeout):
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    at.secrets["ADMIN_WACHTWOORD"] = WACHTWOORD
+    at.secrets["SHEETDB_URL"] = server.sheetdb_url
+    at.secrets["GOOGLE_SHEET_URL"] = server.csv_url
+    at.secrets["OPSLAG_PAD"] = str(opslag_pad)
+    return at
+
+
+# ====== Scenario's ======
+def scenario_admin(at, context):
+    yield "start", lambda: at.run()
+    yield "login admin", lambda: at.sidebar.text_input[0].input(WACHTWOORD).run()
+    yield "rerun zonder wijziging", lambda: at.run()
+    filter_dienst = _widget(at.sidebar.multiselect, "Filter op dienst")
+    yield "filter op dienst", lambda: filter_dienst.set_value(filter_dienst.options[:3]).run()
+    yield "filter wissen", lambda: _widget(at.sidebar.multiselect, "Filter op dienst").set_value([]).run()
+    yield "zoek personeelsnummer", lambda: _widget(at.sidebar.text_input, "Zoek op personeelsnummer").input("1001").run()
+    yield "voertuigtype bus", lambda: at.radio(key="overzicht_type").set_value("bus").run()
+    yield "alle busroosters", lambda: at.selectbox(key="overzicht_rooster_bus").set_value("Alle roosters").run()
+    yield "pagina 2", lambda: at.number_input(key="overzicht_pagina").set_value(2).run()
+    yield "grafiek top 25", lambda: at.slider(key="grafiek_n").set_value(25).run()
+    yield "excel aanmaken", lambda: _widget(at.button, "📄 Maak Excel-overzicht per dienst").click().run()
+
+
+def scenario_gebruiker(at, context):
+    nummer = context["personeelsnummer"]
+    yield "start", lambda: at.run()
+    yield "personeelsnummer", lambda: at.text_input[0].input(nummer).run()
+    yield "login", lambda: at.text_input[1].input(controle_code(int(nummer))).run()
+    yield "tramroosters", lambda: _widget(at.multiselect, "Kies één of meerdere tramroosters").set_value(["T24", "TV12"]).run()
+    yield "tramgroepen", lambda: _widget(at.multiselect, "Kies één of meerdere tramgroepen").set_value(["groep1", "groep2"]).run()
+    stap2 = "Stap 2: Selecteer je voorkeuren binnen deze roosters:"
+    yield "voorkeuren kiezen", lambda: _widget(at.multiselect, stap2).set_value(_widget(at.multiselect, stap2).options[:3]).run()
+    yield "bevestigen", lambda: at.checkbox[0].check().run()
+    yield "verzenden", lambda: _widget(at.button, "Verzend je antwoorden").click().run()
+
+
+SCENARIOS = {"admin": scenario_admin, "gebruiker": scenario_gebruiker}
+
+
+def _wacht_op_sync(server, opslag_pad, max_seconden=10):
+    # De sync-thread duwt op de achtergrond; wacht tot de wachtrij leeg is zodat de tellingen vastliggen
+    opslag, werker = bronnen.lokale_opslag(str(opslag_pad), server.sheetdb_url)
+    werker.wek()
+    einde = time.monotonic() + max_seconden
+    while opslag.sync_status()["wachtend"] and time.monotonic() < einde:
+        time.sleep(0.05)
+
+
+def speel_af(naam, server, context, timeout, meet_geheugen=False):
+    _koud()
+    opslag_pad = Path(tempfile.mkdtemp(prefix="bench_")) / "inzendingen.db"
+    at = _nieuwe_app(server, opslag_pad, timeout)
+    voor = server.telling()
+
+    if meet_geheugen:
+        tracemalloc.start()
+    tijden = {}
+    try:
+        for stap, actie in SCENARIOS[naam](at, context):
+            start = time.perf_counter()
+            actie()
+            tijden[stap] = (time.perf_counter() - start) * 1000
+            _controleer(at, stap)
+        piek = tracemalloc.get_traced_memory()[1] / 2 ** 20 if meet_geheugen else None
+    finally:
+        if meet_geheugen:
+            tracemalloc.stop()
+
+    _wacht_op_sync(server, opslag_pad)
+    na = server.telling()
+    upstream = {k: na.get(k, 0) - voor.get(k, 0) for k in sorted(set(na) | set(voor)) if na.get(k, 0) - voor.get(k, 0)}
+    return tijden, piek, upstream
+
+
+def meet(args):
+    rijen, personeel_csv = maak_dataset(args.chauffeurs, args.inzendingen, seed=args.seed)
+    context = {"personeelsnummer": rijen[0]["Personeelsnummer"]}
+    resultaten = {}
+    with NepServer(rijen, personeel_csv, args.latentie_ms, args.jitter_ms, args.foutkans, args.seed) as server:
+        for naam in args.scenarios:
+            runs = [speel_af(naam, server, context, args.timeout) for _ in range(args.herhalingen)]
+            _, piek, _ = speel_af(naam, server, context, args.timeout, meet_geheugen=True)
+            stappen = {stap: statistics.median(r[0][stap] for r in runs) for stap in runs[0][0]}
+            resultaten[naam] = {
+                "stappen_ms": {k: round(v, 1) for k, v in stappen.items()},
+                "totaal_ms": round(sum(stappen.values()), 1),
+                "piek_mb": round(piek, 1),
+                "upstream": runs[0][2],
+            }
+    return {
+        "meta": {
+            "chauffeurs": args.chauffeurs,
+            "inzendingen": args.inzendingen,
+            "latentie_ms": args.latentie_ms,
+            "jitter_ms": args.jitter_ms,
+            "foutkans": args.foutkans,
+            "herhalingen": args.herhalingen,
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+        },
+        "scenarios": resultaten,
+    }
+
+
+# ====== Rapport en vergelijking ======
+def toon(resultaat):
+    for naam, r in resultaat["scenarios"].items():
+        print(f"\n== {naam}: totaal {r['totaal_ms']:.0f} ms, piek {r['piek_mb']:.1f} MiB, upstream {r['upstream']}")
+        for stap, ms in r["stappen_ms"].items():
+            print(f"   {stap:<28} {ms:>9.1f} ms")
+
+
+def vergelijk(huidig, baseline, tolerantie, min_verschil_ms):
+    problemen = []
+    for naam, basis in baseline["scenarios"].items():
+        nu = huidig["scenarios"].get(naam)
+        if nu is None:
+            continue
+        if nu["totaal_ms"] > basis["totaal_ms"] * (1 + tolerantie) and nu["totaal_ms"] - basis["totaal_ms"] > min_verschil_ms:
+            problemen.append(f"{naam}: totaal {basis['totaal_ms']:.0f} -> {nu['totaal_ms']:.0f} ms")
+        for stap, ms in nu["stappen_ms"].items():
+            oud = basis["stappen_ms"].get(stap)
+            if oud is not None and ms > oud * (1 + tolerantie) and ms - oud > min_verschil_ms:
+                problemen.append(f"{naam} / {stap}: {oud:.0f} -> {ms:.0f} ms")
+        if nu["piek_mb"] > basis["piek_mb"] * (1 + tolerantie):
+            problemen.append(f"{naam}: geheugenpiek {basis['piek_mb']:.1f} -> {nu['piek_mb']:.1f} MiB")
+        for endpoint, aantal in nu["upstream"].items():
+            if aantal > basis["upstream"].get(endpoint, 0):
+                problemen.append(f"{naam}: upstream {endpoint} {basis['upstream'].get(endpoint, 0)} -> {aantal}")
+    return problemen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chauffeurs", type=int, default=3000)
+    parser.add_argument("--inzendingen", type=int, default=2000)
+    parser.add_argument("--latentie-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--foutkans", type=float, default=0.0)
+    parser.add_argument("--herhalingen", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--uitvoer", type=Path, help="resultaat als JSON wegschrijven")
+    parser.add_argument("--bewaar-baseline", nargs="?", const=BASELINE, type=Path)
+    parser.add_argument("--vergelijk", nargs="?", const=BASELINE, type=Path)
+    parser.add_argument("--tolerantie", type=float, default=0.25, help="toegelaten relatieve achteruitgang")
+    parser.add_argument("--min-verschil-ms", type=float, default=50.0, help="kleinere verschillen zijn ruis")
+    args = parser.parse_args()
+
+    # Vóór de meting controleren: anders ontdekt men een ontbrekende baseline pas na minuten meten
+    if args.vergelijk and not args.vergelijk.is_file():
+        parser.error(
+            f"baseline {args.vergelijk} bestaat niet; maak er eerst een met --bewaar-baseline "
+            "(op de referentiecommit) of geef een bestaand bestand aan --vergelijk"
+        )
+
+    resultaat = meet(args)
+    toon(resultaat)
+
+    if args.uitvoer:
+        args.uitvoer.write_text(json.dumps(resultaat, indent=2, ensure_ascii=False))
+    if args.bewaar_baseline:
+        args.bewaar_baseline.write_text(json.dumps(resultaat, indent=2, ensure_ascii=False))
+        print(f"\nBaseline bewaard in {args.bewaar_baseline}")
+    if args.vergelijk:
+        baseline = json.loads(args.vergelijk.read_text())
+        if baseline["meta"]["chauffeurs"] != args.chauffeurs or baseline["meta"]["inzendingen"] != args.inzendingen:
+            print("\n⚠️ Baseline gemeten op een andere datasetgrootte; vergelijking is indicatief.")
+        problemen = vergelijk(resultaat, baseline, args.tolerantie, args.min_verschil_ms)
+        if problemen:
+            print("\n❌ Regressies t.o.v. baseline:")
+            for p in problemen:
+                print(f"   {p}")
+            sys.exit(1)
+        print("\n✅ Geen regressies t.o.v. baseline.")
+
+
+if __name__ == "__main__":
+    main()
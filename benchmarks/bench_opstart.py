@@ -0,0 +1,142 @@
+"""Koude start van een chauffeurssessie: hoe snel is de gebruikerspagina bruikbaar?
+
+Elke herhaling draait in een vers Python-proces, zoals na een herstart van de container.
+Streamlit zelf wordt vooraf geïmporteerd (dat doet de server ook voor het eerste script);
+gemeten wordt vanaf de eerste scriptrun:
+
+    eerste weergave   eerste run van het script (imports, catalogus, CSS, uitleg)
+    interactief       personeelsnummer en code ingegeven, keuzelijsten zichtbaar
+
+Daarnaast toont het welke zware modules (pandas, matplotlib, openpyxl, ...) geladen zijn.
+
+    python benchmarks/bench_opstart.py
+    python benchmarks/bench_opstart.py --app /pad/naar/oude/checkout/app_diensten.py.py
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HIER = Path(__file__).resolve().parent
+ROOT = HIER.parent
+
+ZWARE_MODULES = ("pandas", "numpy", "matplotlib", "openpyxl", "streamlit_sortables")
+WACHTWOORD = "benchmark"
+
+
+# ====== Eén koude sessie (in een apart proces) ======
+def _sessie(instellingen):
+    t0 = time.perf_counter()
+    import streamlit  # noqa: F401
+    from streamlit import config as st_config
+    from streamlit import logger as st_logger
+    from streamlit.testing.v1 import AppTest
+
+    st_config.set_option("logger.level", "error")
+    st_logger.set_log_level("error")
+    streamlit_ms = (time.perf_counter() - t0) * 1000
+
+    app = Path(instellingen["app"])
+    sys.path.insert(0, str(app.parent))
+    at = AppTest.from_file(str(app), default_timeout=instellingen["timeout"])
+    at.secrets["ADMIN_WACHTWOORD"] = WACHTWOORD
+    at.secrets["SHEETDB_URL"] = instellingen["sheetdb_url"]
+    at.secrets["GOOGLE_SHEET_URL"] = instellingen["csv_url"]
+    at.secrets["OPSLAG_PAD"] = instellingen["opslag_pad"]
+
+    start = time.perf_counter()
+    at.run()
+    eerste_weergave = (time.perf_counter() - start) * 1000
+    at.text_input[0].input(instellingen["personeelsnummer"]).run()
+    at.text_input[1].input(instellingen["code"]).run()
+    interactief = (time.perf_counter() - start) * 1000
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    if not any(m.label.startswith("Stap 2") for m in at.multiselect):
+        raise RuntimeError("login mislukt: keuzelijsten niet zichtbaar")
+
+    print(json.dumps({
+        "streamlit_ms": streamlit_ms,
+        "eerste_weergave_ms": eerste_weergave,
+        "interactief_ms": interactief,
+        "modules": [m for m in ZWARE_MODULES if m in sys.modules],
+    }))
+
+
+# ====== Meting over verse processen ======
+def meet(args):
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(HIER))
+    from dataset import controle_code, maak_dataset
+    from nep_server import NepServer
+    from opslag import Opslag
+
+    rijen, personeel_csv = maak_dataset(args.chauffeurs, args.inzendingen, seed=args.seed)
+    nummer = rijen[0]["Personeelsnummer"]
+
+    # Bestaande lokale opslag, zoals na een herstart: enkel de personeelslijst komt koud binnen
+    opslag_pad = Path(tempfile.mkdtemp(prefix="opstart_")) / "inzendingen.db"
+    Opslag(str(opslag_pad)).importeer(rijen)
+
+    runs = []
+    with NepServer(rijen, personeel_csv, args.latentie_ms) as server:
+        instellingen = {
+            "app": str(args.app.resolve()),
+            "sheetdb_url": server.sheetdb_url,
+            "csv_url": server.csv_url,
+            "opslag_pad": str(opslag_pad),
+            "personeelsnummer": nummer,
+            "code": controle_code(int(nummer)),
+            "timeout": args.timeout,
+        }
+        for _ in range(args.herhalingen):
+            uit = subprocess.run(
+                [sys.executable, __file__, "--sessie", json.dumps(instellingen)],
+                capture_output=True, text=True, check=True, cwd=str(args.app.parent),
+            )
+            runs.append(json.loads(uit.stdout.strip().splitlines()[-1]))
+
+    return {
+        "app": str(args.app),
+        "herhalingen": args.herhalingen,
+        "streamlit_ms": round(statistics.median(r["streamlit_ms"] for r in runs), 1),
+        "eerste_weergave_ms": round(statistics.median(r["eerste_weergave_ms"] for r in runs), 1),
+        "interactief_ms": round(statistics.median(r["interactief_ms"] for r in runs), 1),
+        "modules": runs[-1]["modules"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", type=Path, default=ROOT / "app_diensten.py.py")
+    parser.add_argument("--chauffeurs", type=int, default=3000)
+    parser.add_argument("--inzendingen", type=int, default=2000)
+    parser.add_argument("--latentie-ms", type=float, default=0.0)
+    parser.add_argument("--herhalingen", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--uitvoer", type=Path, help="resultaat als JSON wegschrijven")
+    parser.add_argument("--sessie", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.sessie:
+        _sessie(json.loads(args.sessie))
+        return
+
+    resultaat = meet(args)
+    print(f"\n== koude chauffeurssessie ({resultaat['herhalingen']}× vers proces, mediaan)")
+    print(f"   import streamlit (server)    {resultaat['streamlit_ms']:>9.1f} ms")
+    print(f"   eerste weergave              {resultaat['eerste_weergave_ms']:>9.1f} ms")
+    print(f"   interactief na login         {resultaat['interactief_ms']:>9.1f} ms")
+    print(f"   zware modules geladen        {', '.join(resultaat['modules']) or '-'}")
+    if args.uitvoer:
+        args.uitvoer.write_text(json.dumps(resultaat, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark van de toewijzingsmodule op synthetische data.
+
+    python benchmarks/bench_toewijzing.py --chauffeurs 5000 --open 40
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalogus import CATALOGUS  # noqa: E402
+from toewijzing import bereken_toewijzing  # noqa: E402
+
+
+def synthetische_depot(aantal_chauffeurs, max_voorkeuren, seed):
+    rnd = random.Random(seed)
+    diensten = [d.naam for d in CATALOGUS.diensten]
+    # Scheve populariteit zoals in de echte inzendingen: enkele roosters zijn veel gevraagd
+    gewichten = [1 / (i + 1) ** 0.7 for i in range(len(diensten))]
+
+    voorkeuren, ancienniteit, huidige_plaatsen = {}, {}, {}
+    for i in range(aantal_chauffeurs):
+        nummer = str(100000 + i)
+        gekozen = []
+        for dienst in rnd.choices(diensten, weights=gewichten, k=rnd.randint(1, max_voorkeuren) * 2):
+            if dienst not in gekozen:
+                gekozen.append(dienst)
+        voorkeuren[nummer] = gekozen[:max_voorkeuren]
+        ancienniteit[nummer] = rnd.uniform(0, 40)
+        huidige_plaatsen[nummer] = rnd.choice(diensten)
+    return voorkeuren, ancienniteit, huidige_plaatsen
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chauffeurs", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--voorkeuren", type=int, default=15)
+    parser.add_argument("--open", type=int, default=40)
+    parser.add_argument("--herhalingen", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    diensten = [d.naam for d in CATALOGUS.diensten]
+    print(f"{'chauffeurs':>10} {'voorkeuren':>10} {'toegewezen':>10} {'onvervuld':>9} {'beste ms':>9} {'mediaan ms':>10}")
+    for aantal in args.chauffeurs:
+        voorkeuren, ancienniteit, huidige = synthetische_depot(aantal, args.voorkeuren, args.seed)
+        open_plaatsen = rnd.choices(diensten, k=args.open)
+
+        tijden = []
+        for _ in range(args.herhalingen):
+            start = time.perf_counter()
+            resultaat = bereken_toewijzing(open_plaatsen, voorkeuren, ancienniteit, huidige)
+            tijden.append((time.perf_counter() - start) * 1000)
+        tijden.sort()
+        print(
+            f"{aantal:>10} {sum(map(len, voorkeuren.values())):>10} {len(resultaat.toewijzingen):>10} "
+            f"{len(resultaat.onvervuld):>9} {tijden[0]:>9.1f} {tijden[len(tijden) // 2]:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Synthetische personeelslijst en inzendingen op realistische schaal."""
+import csv
+import io
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalogus import CATALOGUS  # noqa: E402
+
+EERSTE_NUMMER = 100000
+
+
+def controle_code(nummer):
+    return f"{nummer % 10000:04d}"
+
+
+def maak_dataset(chauffeurs=3000, inzendingen=2000, max_voorkeuren=12, seed=1):
+    rnd = random.Random(seed)
+    diensten = [d.naam for d in CATALOGUS.diensten]
+    # Scheve populariteit: enkele roosters worden veel vaker gevraagd dan andere
+    gewichten = [1 / (i + 1) ** 0.7 for i in range(len(diensten))]
+    rnd.shuffle(gewichten)
+
+    personeel = io.StringIO()
+    schrijver = csv.writer(personeel, lineterminator="\n")
+    schrijver.writerow(["personeelsnummer", "naam", "teamcoach", "controle", "stelplaatsanciënniteit", "huidige dienst"])
+    for i in range(chauffeurs):
+        nummer = EERSTE_NUMMER + i
+        schrijver.writerow([
+            nummer, f"Chauffeur {nummer}", f"Coach {i % 25}", controle_code(nummer),
+            f"{rnd.uniform(0, 40):.2f}", rnd.choice(diensten),
+        ])
+
+    start = datetime(2025, 1, 6, 8, 0)
+    rijen = []
+    for i in rnd.sample(range(chauffeurs), min(inzendingen, chauffeurs)):
+        nummer = EERSTE_NUMMER + i
+        gekozen = []
+        for dienst in rnd.choices(diensten, weights=gewichten, k=max_voorkeuren * 2):
+            if dienst not in gekozen:
+                gekozen.append(dienst)
+        gekozen = gekozen[:rnd.randint(1, max_voorkeuren)]
+        ingevuld = start + timedelta(minutes=rnd.randint(0, 60 * 24 * 14))
+        rijen.append({
+            "Personeelsnummer": str(nummer),
+            "Naam": f"Chauffeur {nummer}",
+            "Teamcoach": f"Coach {i % 25}",
+            "Voorkeuren": ", ".join(gekozen),
+            "Roostertype": "",
+            "Bevestiging plaatsvoorkeur": "True",
+            "Ingevuld op": ingevuld.strftime("%Y-%m-%d %H:%M:%S"),
+            "Laatste aanpassing": ingevuld.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return rijen, personeel.getvalue()
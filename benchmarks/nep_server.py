@@ -0,0 +1,171 @@
+"""Lokale stand-in voor SheetDB en de gepubliceerde Google Sheet (CSV).
+
+Ondersteunt dezelfde endpoints als de app gebruikt:
+
+    GET  /api/v1/<id>                              lijst
+    GET  /api/v1/<id>/search?Personeelsnummer=...  zoek
+    PUT  /api/v1/<id>/Personeelsnummer/<nummer>    bijwerken
+    POST /api/v1/<id>                              aanmaken (één rij of een lijst)
+    GET  /personeel.csv                            personeel (met ETag / 304)
+
+Latentie en fouten (429/503) zijn instelbaar; elke oproep wordt per endpoint geteld.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+SHEET_ID = "nep"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "NepSheetDB/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    # ====== Hulpfuncties ======
+    def _antwoord(self, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, data):
+        self._antwoord(status, json.dumps(data).encode())
+
+    def _lees_json(self):
+        lengte = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(lengte) or b"{}")
+
+    def _vooraf(self, endpoint):
+        # Telt de oproep, wacht de ingestelde latentie af en injecteert eventueel een fout
+        nep = self.server.nep
+        nep.tel(endpoint)
+        vertraging = nep.latentie_ms + nep.rnd_uniform(0, nep.jitter_ms)
+        if vertraging:
+            time.sleep(vertraging / 1000)
+        if nep.foutkans and nep.rnd_uniform(0, 1) < nep.foutkans:
+            status = 429 if nep.rnd_uniform(0, 1) < 0.5 else 503
+            self._json(status, {"error": "geïnjecteerde fout"})
+            return False
+        return True
+
+    # ====== Routes ======
+    def do_GET(self):
+        deel = urlsplit(self.path)
+        pad = unquote(deel.path).rstrip("/")
+        nep = self.server.nep
+
+        if pad == "/personeel.csv":
+            if not self._vooraf("personeel"):
+                return
+            if self.headers.get("If-None-Match") == nep.etag:
+                self._antwoord(304, headers={"ETag": nep.etag})
+            else:
+                self._antwoord(200, nep.csv, "text/csv; charset=utf-8", {"ETag": nep.etag})
+        elif pad == f"/api/v1/{SHEET_ID}":
+            if self._vooraf("lijst"):
+                with nep.slot:
+                    self._json(200, nep.rijen)
+        elif pad == f"/api/v1/{SHEET_ID}/search":
+            if self._vooraf("zoek"):
+                nummer = parse_qs(deel.query).get("Personeelsnummer", [""])[0]
+                with nep.slot:
+                    self._json(200, [r for r in nep.rijen if r.get("Personeelsnummer") == nummer])
+        else:
+            self._json(404, {"error": "onbekend pad"})
+
+    def do_PUT(self):
+        pad = unquote(urlsplit(self.path).path).rstrip("/")
+        prefix = f"/api/v1/{SHEET_ID}/Personeelsnummer/"
+        if not pad.startswith(prefix):
+            return self._json(404, {"error": "onbekend pad"})
+        if not self._vooraf("bijwerken"):
+            return
+        nummer = pad[len(prefix):]
+        data = self._lees_json().get("data", {})
+        nep = self.server.nep
+        with nep.slot:
+            geraakt = [r for r in nep.rijen if r.get("Personeelsnummer") == nummer]
+            for rij in geraakt:
+                rij.update(data)
+        self._json(200, {"updated": len(geraakt)})
+
+    def do_POST(self):
+        pad = unquote(urlsplit(self.path).path).rstrip("/")
+        if pad != f"/api/v1/{SHEET_ID}":
+            return self._json(404, {"error": "onbekend pad"})
+        if not self._vooraf("aanmaken"):
+            return
+        data = self._lees_json().get("data", [])
+        nieuwe = data if isinstance(data, list) else [data]
+        nep = self.server.nep
+        with nep.slot:
+            nep.rijen.extend(dict(r) for r in nieuwe)
+        self._json(201, {"created": len(nieuwe)})
+
+
+class NepServer:
+    def __init__(self, inzendingen, personeel_csv, latentie_ms=0.0, jitter_ms=0.0, foutkans=0.0, seed=0):
+        self.rijen = [dict(r) for r in inzendingen]
+        self.csv = personeel_csv.encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.csv).hexdigest()[:16] + '"'
+        self.latentie_ms = latentie_ms
+        self.jitter_ms = jitter_ms
+        self.foutkans = foutkans
+        self.oproepen = Counter()
+        self.slot = threading.Lock()
+        self._rnd = random.Random(seed)
+        self._rnd_slot = threading.Lock()
+        self._httpd = None
+
+    def rnd_uniform(self, a, b):
+        with self._rnd_slot:
+            return self._rnd.uniform(a, b)
+
+    def tel(self, endpoint):
+        with self.slot:
+            self.oproepen[endpoint] += 1
+
+    def telling(self):
+        with self.slot:
+            return dict(self.oproepen)
+
+    @property
+    def basis_url(self):
+        host, poort = self._httpd.server_address[:2]
+        return f"http://{host}:{poort}"
+
+    @property
+    def sheetdb_url(self):
+        return f"{self.basis_url}/api/v1/{SHEET_ID}"
+
+    @property
+    def csv_url(self):
+        return f"{self.basis_url}/personeel.csv"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.nep = self
+        threading.Thread(target=self._httpd.serve_forever, name="nep-sheetdb", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
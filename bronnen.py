@@ -0,0 +1,186 @@
+import csv
+import hashlib
+import hmac
+import io
+import os
+import threading
+import time
+from typing import NamedTuple
+
+import streamlit as st
+
+from opslag import Opslag
+from sheetdb import SheetDB, verzoek
+from sync import SyncWerker
+
+
+# ====== Cache-instellingen ======
+def _lees_ttl():
+    try:
+        return int(st.secrets.get("CACHE_TTL_SECONDEN", 300))
+    except (FileNotFoundError, ValueError):
+        return 300
+
+
+CACHE_TTL = _lees_ttl()
+
+# Tellers leven per proces (de module blijft geladen tussen reruns en sessies)
+_statistiek = {
+    "inzendingen": {"oproepen": 0, "misses": 0},
+    "personeel": {"oproepen": 0, "misses": 0},
+}
+_slot = threading.Lock()
+
+
+def _tel(bron, soort):
+    with _slot:
+        _statistiek[bron][soort] += 1
+
+
+def cache_statistiek():
+    with _slot:
+        return {
+            bron: {"hits": s["oproepen"] - s["misses"], "misses": s["misses"]}
+            for bron, s in _statistiek.items()
+        }
+
+
+# ====== SheetDB (inzendingen) ======
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _haal_inzendingen(url):
+    _tel("inzendingen", "misses")
+    return SheetDB(url).lijst()
+
+
+def haal_inzendingen(url):
+    _tel("inzendingen", "oproepen")
+    return _haal_inzendingen(url)
+
+
+def ververs_inzendingen():
+    _haal_inzendingen.clear()
+
+
+def herlaad_inzendingen(opslag, url):
+    # SheetDB opnieuw lezen en de lokale opslag ermee afstemmen (wijzigingen door admins in de sheet)
+    # Versies vastleggen vóór de GET: wat de sync-thread intussen pusht, mag de lijst niet terugdraaien
+    stabiel = opslag.stabiele_versies()
+    ververs_inzendingen()
+    return opslag.herlaad(haal_inzendingen(url), stabiel)
+
+
+# ====== Lokale opslag (primair) met SheetDB als spiegel ======
+@st.cache_resource(show_spinner="Lokale opslag wordt geopend...")
+def lokale_opslag(pad, url):
+    # Eén opslag en één sync-thread per proces; bij een lege opslag eerst SheetDB inlezen
+    opslag = Opslag(pad)
+    if opslag.is_leeg():
+        opslag.importeer(haal_inzendingen(url))
+    werker = SyncWerker(opslag, url)
+    werker.start()
+    return opslag, werker
+
+
+# ====== Google Sheet (personeel) ======
+class Medewerker(NamedTuple):
+    naam: str
+    teamcoach: str
+    controle_hash: bytes
+    ancienniteit: str = ""     # stelplaatsanciënniteit zoals in de sheet (optionele kolom)
+    huidige_dienst: str = ""   # huidige plaats (optionele kolom)
+
+
+ANCIENNITEIT_KOLOMMEN = ("stelplaatsanciënniteit", "stelplaatsancienniteit", "anciënniteit", "ancienniteit")
+
+
+# Zout per proces: de hashes verlaten het geheugen van dit proces nooit
+_zout = os.urandom(16)
+
+
+def _hash_controle(personeelsnummer, code):
+    return hashlib.sha256(_zout + f"{personeelsnummer}:{code}".encode()).digest()
+
+
+class _PersoneelIndex:
+    def __init__(self):
+        self.medewerkers = {}
+        self.etag = None
+        self.laatst_gewijzigd = None
+        self.inhoud_hash = None
+        self.gecontroleerd_op = 0.0
+
+
+_personeel = _PersoneelIndex()
+_personeel_slot = threading.Lock()
+
+
+def _bouw_index(tekst):
+    reader = csv.DictReader(io.StringIO(tekst))
+    reader.fieldnames = [k.strip().lower() for k in reader.fieldnames or []]
+    medewerkers = {}
+    for rij in reader:
+        nummer = (rij.get("personeelsnummer") or "").strip()
+        if not nummer:
+            continue
+        medewerkers[nummer] = Medewerker(
+            naam=rij.get("naam") or "",
+            teamcoach=rij.get("teamcoach") or "",
+            controle_hash=_hash_controle(nummer, (rij.get("controle") or "").strip()),
+            ancienniteit=next((rij[k].strip() for k in ANCIENNITEIT_KOLOMMEN if rij.get(k)), ""),
+            huidige_dienst=(rij.get("huidige dienst") or "").strip(),
+        )
+    return medewerkers
+
+
+def _vernieuw_personeel(url):
+    # Voorwaardelijke GET: bij 304 of ongewijzigde inhoud blijft de index staan
+    headers = {}
+    if _personeel.etag:
+        headers["If-None-Match"] = _personeel.etag
+    if _personeel.laatst_gewijzigd:
+        headers["If-Modified-Since"] = _personeel.laatst_gewijzigd
+
+    _tel("personeel", "misses")
+    response = verzoek("personeel", "GET", url, headers=headers)
+    _personeel.gecontroleerd_op = time.monotonic()
+    if response.status_code == 304:
+        return
+
+    _personeel.etag = response.headers.get("ETag")
+    _personeel.laatst_gewijzigd = response.headers.get("Last-Modified")
+    inhoud_hash = hashlib.sha256(response.content).hexdigest()
+    if inhoud_hash != _personeel.inhoud_hash:
+        _personeel.medewerkers = _bouw_index(response.content.decode("utf-8-sig"))
+        _personeel.inhoud_hash = inhoud_hash
+
+
+def _personeel_actueel(url):
+    # Oproeper houdt _personeel_slot vast
+    if time.monotonic() - _personeel.gecontroleerd_op >= CACHE_TTL or not _personeel.medewerkers:
+        _vernieuw_personeel(url)
+    return _personeel.medewerkers
+
+
+def zoek_medewerker(url, personeelsnummer, code):
+    _tel("personeel", "oproepen")
+    with _personeel_slot:
+        medewerker = _personeel_actueel(url).get(personeelsnummer.strip())
+    if medewerker is None:
+        return None
+    if not hmac.compare_digest(medewerker.controle_hash, _hash_controle(personeelsnummer.strip(), code)):
+        return None
+    return medewerker
+
+
+def alle_medewerkers(url):
+    _tel("personeel", "oproepen")
+    with _personeel_slot:
+        return dict(_personeel_actueel(url))
+
+
+def ververs_personeel():
+    # Volgende login controleert de sheet opnieuw, zonder voorwaardelijke headers
+    with _personeel_slot:
+        _personeel.etag = None
+        _personeel.laatst_gewijzigd = None
+        _personeel.gecontroleerd_op = 0.0
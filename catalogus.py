@@ -0,0 +1,68 @@
+import csv
+from pathlib import Path
+from typing import NamedTuple
+
+ROOSTERS_CSV = Path(__file__).with_name("roosters.csv")
+TYPES = ("tram", "bus", "gemengd")
+
+
+class Dienst(NamedTuple):
+    naam: str          # zoals getoond en opgeslagen in "Voorkeuren", bv. "TV12 (Tram Vroeg groep1)"
+    code: str          # roostercode, bv. "TV12"
+    type: str          # "tram", "bus" of "gemengd"
+    groep: int
+    omschrijving: str
+
+
+def groep_label(groep):
+    return f"groep{groep}"
+
+
+class Catalogus:
+    def __init__(self, diensten):
+        self.diensten = tuple(diensten)
+        self.namen = frozenset(d.naam for d in self.diensten)
+        self.per_naam = {d.naam: d for d in self.diensten}
+        self.per_type = {t: [d.naam for d in self.diensten if d.type == t] for t in TYPES}
+        self._index = {(d.type, d.code, groep_label(d.groep)): d.naam for d in self.diensten}
+        self._roosters = {t: sorted({d.code for d in self.diensten if d.type == t}) for t in TYPES}
+        self._groepen = {
+            t: [groep_label(g) for g in sorted({d.groep for d in self.diensten if d.type == t})]
+            for t in TYPES
+        }
+
+    def __contains__(self, naam):
+        return naam in self.namen
+
+    def roosters(self, type_):
+        return self._roosters[type_]
+
+    def groepen(self, type_):
+        return self._groepen[type_]
+
+    def filter(self, type_, roosters, groepen):
+        # Rechtstreekse opzoeking per (type, rooster, groep) i.p.v. tekstvergelijkingen
+        return [
+            self._index[(type_, r, g)]
+            for r in roosters for g in groepen
+            if (type_, r, g) in self._index
+        ]
+
+
+def laad_catalogus(pad=ROOSTERS_CSV):
+    # Eén rij per rooster; elke groep 1..groepen wordt een dienst
+    diensten = []
+    with open(pad, newline="", encoding="utf-8") as f:
+        for rij in csv.DictReader(f):
+            for groep in range(1, int(rij["groepen"]) + 1):
+                diensten.append(Dienst(
+                    naam=f"{rij['code']} ({rij['omschrijving']} {groep_label(groep)})",
+                    code=rij["code"],
+                    type=rij["type"],
+                    groep=groep,
+                    omschrijving=rij["omschrijving"],
+                ))
+    return Catalogus(diensten)
+
+
+CATALOGUS = laad_catalogus()
@@ -0,0 +1,152 @@
+from collections import Counter
+from typing import NamedTuple
+
+import pandas as pd
+
+from catalogus import CATALOGUS
+from voorkeuren import dienst_index, explodeer_voorkeuren, numerieke_nummers, verwerk_inzendingen
+
+
+class Delta(NamedTuple):
+    nieuw: list
+    gewijzigd: list
+    verwijderd: list
+    volledig: bool
+
+    def __bool__(self):
+        return self.volledig or bool(self.nieuw or self.gewijzigd or self.verwijderd)
+
+
+def _samenvoegen(behouden, nieuw):
+    delen = [d for d in (behouden, nieuw) if not d.empty]
+    return pd.concat(delen) if len(delen) > 1 else (delen[0] if delen else behouden)
+
+
+def _sleutels(records):
+    # Personeelsnummer als sleutel; dubbels krijgen een volgnummer zodat elke rij uniek blijft
+    gezien = Counter()
+    sleutels = []
+    for record in records:
+        nummer = str(record.get("Personeelsnummer", "")).strip()
+        gezien[nummer] += 1
+        sleutels.append(nummer if gezien[nummer] == 1 else f"{nummer}#{gezien[nummer]}")
+    return sleutels
+
+
+class DashboardStand:
+    # Laatst verwerkte momentopname van de inzendingen voor de adminpagina.
+    # Enkel nieuwe, gewijzigde of verwijderde inzendingen worden opnieuw verwerkt.
+
+    def __init__(self):
+        self.schema = None
+        self.versies = {}           # sleutel -> "Laatste aanpassing"
+        self.df = None              # verwerkte inzendingen, index = sleutel
+        self.lang = None            # explodeer_voorkeuren(self.df)
+        self.telling = Counter()    # dienst -> aantal voorkeuren
+        self.rijen_per_dienst = {}  # dienst -> set(sleutels)
+        self.tabellen = {}          # dienst -> DataFrame(Personeelsnummer, Naam)
+        self.versie = 0             # verhoogt bij elke wijziging in de data
+        self._indeling = (None, {})
+
+    @property
+    def diensten(self):
+        return sorted(self.rijen_per_dienst)
+
+    def indeling(self):
+        # voertuigtype -> roostercode -> diensten; één keer berekend per dataversie
+        versie, indeling = self._indeling
+        if versie != self.versie:
+            indeling = {}
+            for dienst in self.diensten:
+                info = CATALOGUS.per_naam.get(dienst)
+                type_, code = (info.type, info.code) if info else ("overige", dienst.split(" ")[0])
+                indeling.setdefault(type_, {}).setdefault(code, []).append(dienst)
+            self._indeling = (self.versie, indeling)
+        return indeling
+
+    @property
+    def telling_reeks(self):
+        return pd.Series(dict(self.telling.most_common()), dtype="int64")
+
+    def bijwerken(self, records):
+        sleutels = _sleutels(records)
+        schema = frozenset(k for record in records for k in record)
+        versies = {k: record.get("Laatste aanpassing") for k, record in zip(sleutels, records)}
+
+        if self.df is None or schema != self.schema:
+            self._volledig(records, sleutels, schema, versies)
+            return Delta(list(versies), [], [], True)
+
+        nieuw = [k for k in versies if k not in self.versies]
+        gewijzigd = [k for k, v in versies.items() if k in self.versies and self.versies[k] != v]
+        verwijderd = [k for k in self.versies if k not in versies]
+        delta = Delta(nieuw, gewijzigd, verwijderd, False)
+        if delta:
+            self._pas_toe(delta, records, sleutels)
+            self.versies = versies
+            self.versie += 1
+        return delta
+
+    def _verwerk(self, records, sleutels):
+        df = pd.DataFrame(records, index=pd.Index(sleutels, name="sleutel"))
+        return verwerk_inzendingen(df)
+
+    def _volledig(self, records, sleutels, schema, versies):
+        self.schema = schema
+        self.versies = versies
+        self.df = self._verwerk(records, sleutels)
+        self.lang = explodeer_voorkeuren(self.df)
+        self.telling = Counter(self.lang["dienst"].tolist())
+        self.rijen_per_dienst = {d: set(rijen) for d, rijen in dienst_index(self.lang).items()}
+        self.tabellen = self._bouw_tabellen(self.lang)
+        self.versie += 1
+
+    def _pas_toe(self, delta, records, sleutels):
+        te_verwerken = set(delta.nieuw) | set(delta.gewijzigd)
+        weg = set(delta.gewijzigd) | set(delta.verwijderd)
+
+        if te_verwerken:
+            delta_df = self._verwerk(
+                [r for k, r in zip(sleutels, records) if k in te_verwerken],
+                [k for k in sleutels if k in te_verwerken],
+            )
+            delta_lang = explodeer_voorkeuren(delta_df)
+        else:
+            delta_df, delta_lang = self.df.iloc[0:0], self.lang.iloc[0:0]
+        oud_lang = self.lang[self.lang.index.isin(weg)]
+
+        # Telling en dienstindex bijwerken met enkel de oude en nieuwe rijen van de delta
+        self.telling.subtract(oud_lang["dienst"].tolist())
+        self.telling.update(delta_lang["dienst"].tolist())
+        self.telling = +self.telling
+        for dienst, sleutel in zip(oud_lang["dienst"], oud_lang.index):
+            self.rijen_per_dienst[dienst].discard(sleutel)
+        for dienst, sleutel in zip(delta_lang["dienst"], delta_lang.index):
+            self.rijen_per_dienst.setdefault(dienst, set()).add(sleutel)
+
+        self.df = _samenvoegen(self.df[~self.df.index.isin(weg)], delta_df)
+        self.lang = _samenvoegen(self.lang[~self.lang.index.isin(weg)], delta_lang)
+
+        # Enkel de tabellen van diensten die de delta raakt opnieuw opbouwen
+        geraakt = set(oud_lang["dienst"]) | set(delta_lang["dienst"])
+        for dienst in geraakt:
+            if not self.rijen_per_dienst.get(dienst):
+                self.rijen_per_dienst.pop(dienst, None)
+            self.tabellen.pop(dienst, None)
+        self.tabellen.update(self._bouw_tabellen(self.lang[self.lang["dienst"].isin(geraakt)]))
+
+    def _bouw_tabellen(self, lang):
+        nummers = numerieke_nummers(self.df[self.df.index.isin(lang.index)])
+        koppel = (
+            lang[["dienst"]]
+            .reset_index()
+            .drop_duplicates()
+            .join(nummers, on="sleutel", how="inner")
+        )
+        return {
+            # Stabiel en op naam bij gelijk nummer: dezelfde volgorde na een delta als na een volledige opbouw
+            dienst: groep[["Personeelsnummer", "Naam"]]
+            .sort_values(["Personeelsnummer", "Naam"], kind="stable")
+            .reset_index(drop=True)
+            for dienst, groep in koppel.groupby("dienst")
+        }
@@ -0,0 +1,51 @@
+import io
+import re
+
+import streamlit as st
+from openpyxl import Workbook
+
+from catalogus import CATALOGUS, groep_label
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+_ONGELDIGE_TEKENS = re.compile(r"[\[\]:*?/\\]")
+
+
+def _korte_titel(dienst):
+    # Catalogusdiensten als "T24 groep3": de volledige naam loopt vaak gelijk tot voorbij 31 tekens
+    gekend = CATALOGUS.per_naam.get(dienst)
+    if gekend is not None:
+        return f"{gekend.code} {groep_label(gekend.groep)}"
+    return dienst
+
+
+def werkbladtitels(diensten):
+    # Excel laat max. 31 tekens toe en titels moeten uniek zijn (hoofdletterongevoelig)
+    titels = []
+    gebruikt = set()
+    for dienst in diensten:
+        basis = _ONGELDIGE_TEKENS.sub("-", _korte_titel(dienst))[:31]
+        titel, n = basis, 1
+        while titel.lower() in gebruikt:
+            n += 1
+            achtervoegsel = f"~{n}"
+            titel = basis[:31 - len(achtervoegsel)] + achtervoegsel
+        gebruikt.add(titel.lower())
+        titels.append(titel)
+    return titels
+
+
+@st.cache_data(max_entries=4, show_spinner="Excel-overzicht wordt aangemaakt...")
+def excel_per_dienst(vingerafdruk, _tabellen):
+    # _tabellen: dienst -> DataFrame(Personeelsnummer, Naam); enkel de vingerafdruk is de cachesleutel
+    wb = Workbook(write_only=True)
+    for titel, (dienst, tabel) in zip(werkbladtitels(_tabellen), _tabellen.items()):
+        ws = wb.create_sheet(title=titel)
+        ws.append([dienst])
+        ws.append(["Personeelsnummer", "Naam"])
+        for rij in zip(tabel["Personeelsnummer"].tolist(), tabel["Naam"].tolist()):
+            ws.append(rij)
+
+    excel_output = io.BytesIO()
+    wb.save(excel_output)
+    return excel_output.getvalue()
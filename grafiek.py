@@ -0,0 +1,59 @@
+import io
+
+import streamlit as st
+from matplotlib.figure import Figure
+
+from catalogus import CATALOGUS
+
+UITSPLITSING = {"alle": "Alle diensten", "tram": "🚋 Tram", "bus": "🚌 Bus", "gemengd": "🔀 Gemengd"}
+
+
+def top_n(telling, n, type_="alle"):
+    # telling is al aflopend gesorteerd
+    if type_ != "alle":
+        telling = telling[[getattr(CATALOGUS.per_naam.get(d), "type", None) == type_ for d in telling.index]]
+    return telling.head(n)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def top_png(diensten, aantallen, titel):
+    # Figure zonder pyplot: niet geregistreerd in de globale figuurlijst, dus geen lek over reruns
+    fig = Figure(figsize=(6.4, max(2.4, 0.3 * len(diensten) + 1.2)))
+    ax = fig.subplots()
+    kleuren = ["#DAA520" if i == 0 else "#CCCCCC" for i in range(len(diensten))]
+    ax.barh(diensten, aantallen, edgecolor="black", color=kleuren)
+    ax.invert_yaxis()
+    ax.set_title(titel)
+    ax.set_xlabel("Aantal voorkeuren")
+    ax.set_ylabel("Dienst")
+
+    png = io.BytesIO()
+    fig.savefig(png, format="png", bbox_inches="tight")
+    fig.clear()
+    return png.getvalue()
+
+
+@st.fragment
+def toon_populairste(telling):
+    # Fragment: N, uitsplitsing of weergave wijzigen herlaadt enkel deze grafiek
+    kol1, kol2, kol3 = st.columns(3)
+    with kol1:
+        n = st.slider("Aantal diensten", 5, 30, 15, key="grafiek_n")
+    with kol2:
+        type_ = st.selectbox("Uitsplitsing", list(UITSPLITSING), format_func=UITSPLITSING.get, key="grafiek_type")
+    with kol3:
+        interactief = st.toggle("Interactieve grafiek", key="grafiek_interactief")
+
+    top = top_n(telling, n, type_)
+    if top.empty:
+        st.info("📉 Nog geen voorkeuren beschikbaar voor de grafiek.")
+        return
+
+    if interactief:
+        data = top.rename_axis("Dienst").reset_index(name="Aantal voorkeuren")
+        st.bar_chart(data, x="Dienst", y="Aantal voorkeuren", horizontal=True, sort="-Aantal voorkeuren")
+    else:
+        titel = f"Top {n} Populairste Diensten"
+        if type_ != "alle":
+            titel += f" – {type_.capitalize()}"
+        st.image(top_png(tuple(top.index), tuple(int(v) for v in top.to_numpy()), titel))
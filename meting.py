@@ -0,0 +1,158 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import streamlit as st
+
+logger = logging.getLogger("diensten.meting")
+
+# Laatste reruns en profielen van dit proces, voor het adminpaneel
+_recente_metingen = deque(maxlen=200)
+_recente_profielen = deque(maxlen=5)
+_slot = threading.Lock()
+
+
+def _lees_secret(naam):
+    try:
+        return st.secrets.get(naam)
+    except FileNotFoundError:
+        return None
+
+
+class _Profiel:
+    # cProfile standaard; ?profiel=pyinstrument gebruikt pyinstrument als het geïnstalleerd is
+    def __init__(self, soort):
+        self.soort = "pyinstrument" if soort == "pyinstrument" else "cprofile"
+        self._profiler = None
+        if self.soort == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                self._profiler = Profiler()
+            except ImportError:
+                self.soort = "cprofile"
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if self.soort == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self):
+        if self.soort == "pyinstrument":
+            self._profiler.stop()
+            return self._profiler.output_text(unicode=True)
+        self._profiler.disable()
+        tekst = io.StringIO()
+        pstats.Stats(self._profiler, stream=tekst).sort_stats("cumulative").print_stats(40)
+        return tekst.getvalue()
+
+
+class Meting:
+    # Tijdmeting per rerun in benoemde fasen (fetch, parse, filter, aggregate, render, export).
+    # Werkt als een rondetimer: begin() sluit de lopende fase af, zodat het script plat blijft.
+
+    def __init__(self, pagina="gebruiker", profiel=None):
+        self.pagina = pagina
+        self.tijdstip = datetime.now().isoformat(timespec="seconds")
+        self.fasen = []
+        self._start = time.perf_counter()
+        self._huidige = None
+        self._totaal = None
+        self._afgerond = False
+        self._profiel = None
+        if profiel:
+            self._profiel = _Profiel(str(profiel).lower())
+            self._profiel.start()
+
+    def begin(self, fase, **details):
+        self._sluit()
+        self._huidige = (fase, time.perf_counter(), details)
+
+    def noteer(self, **details):
+        # Rijen, payloadgrootte, ... bij de lopende fase
+        if self._huidige is not None:
+            self._huidige[2].update(details)
+
+    def _sluit(self):
+        if self._huidige is not None:
+            fase, start, details = self._huidige
+            ms = round((time.perf_counter() - start) * 1000, 2)
+            self.fasen.append({"fase": fase, "ms": ms, **details})
+            self._huidige = None
+
+    @property
+    def totaal_ms(self):
+        if self._totaal is not None:
+            return self._totaal
+        return round((time.perf_counter() - self._start) * 1000, 2)
+
+    def als_record(self):
+        return {
+            "tijdstip": self.tijdstip,
+            "pagina": self.pagina,
+            "totaal_ms": self.totaal_ms,
+            "fasen": self.fasen,
+        }
+
+    def afronden(self):
+        if self._afgerond:
+            return
+        self._sluit()
+        self._totaal = self.totaal_ms
+        self._afgerond = True
+        record = self.als_record()
+
+        if self._profiel is not None:
+            tekst = self._profiel.stop()
+            with _slot:
+                _recente_profielen.append((self.tijdstip, self.pagina, self._profiel.soort, tekst))
+            record["profiel"] = self._profiel.soort
+            # Eén rerun volstaat; de volgende reruns niet opnieuw profileren
+            st.query_params.pop("profiel", None)
+
+        regel = json.dumps(record, ensure_ascii=False)
+        logger.info(regel)
+        with _slot:
+            _recente_metingen.append(record)
+            pad = _lees_secret("METING_LOG")
+            if pad:
+                with open(pad, "a", encoding="utf-8") as f:
+                    f.write(regel + "\n")
+
+
+def recente_metingen():
+    with _slot:
+        return list(_recente_metingen)
+
+
+def recente_profielen():
+    with _slot:
+        return list(_recente_profielen)
+
+
+def toon_paneel(meting):
+    with st.sidebar.expander("⏱️ Meting van deze rerun"):
+        st.caption(f"{meting.pagina} · totaal {meting.totaal_ms:.0f} ms")
+        st.dataframe(meting.fasen, use_container_width=True, hide_index=True)
+        recente = recente_metingen()
+        st.download_button(
+            "📥 Laatste reruns (JSON lines)",
+            data="\n".join(json.dumps(r, ensure_ascii=False) for r in recente),
+            file_name="metingen.jsonl",
+            mime="application/jsonl",
+        )
+        profielen = recente_profielen()
+        if profielen:
+            tijdstip, pagina, soort, tekst = profielen[-1]
+            st.caption(f"Laatste profiel ({soort}, {pagina}, {tijdstip})")
+            st.code(tekst[:20000], language="text")
+        else:
+            st.caption("Voeg ?profiel=1 (of ?profiel=pyinstrument) aan de URL toe om één rerun te profileren.")
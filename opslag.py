@@ -0,0 +1,238 @@
+import json
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inzendingen (
+    personeelsnummer   TEXT PRIMARY KEY,
+    data               TEXT NOT NULL,
+    laatste_aanpassing TEXT,
+    versie             INTEGER NOT NULL DEFAULT 1,
+    in_sheetdb         INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sync_wachtrij (
+    personeelsnummer TEXT PRIMARY KEY,
+    versie           INTEGER NOT NULL,
+    pogingen         INTEGER NOT NULL DEFAULT 0,
+    volgende_poging  REAL NOT NULL DEFAULT 0,
+    fout             TEXT,
+    post_geprobeerd  INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sync_wachtrij_volgende ON sync_wachtrij (volgende_poging);
+"""
+
+
+class Opslag:
+    # Lokale bron van waarheid voor de inzendingen; SheetDB is een spiegel (zie sync.py).
+    # Eén verbinding per proces, beschermd met een slot: sqlite in WAL-modus laat lezers
+    # doorwerken terwijl de sync-thread schrijft.
+
+    def __init__(self, pad):
+        self.pad = pad
+        self._db = sqlite3.connect(pad, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._slot = threading.Lock()
+        with self._slot:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            kolommen = {r["name"] for r in self._db.execute("PRAGMA table_info(sync_wachtrij)")}
+            if "post_geprobeerd" not in kolommen:
+                self._db.execute("ALTER TABLE sync_wachtrij ADD COLUMN post_geprobeerd INTEGER NOT NULL DEFAULT 0")
+
+    # ====== Inzendingen ======
+    def is_leeg(self):
+        with self._slot:
+            return self._db.execute("SELECT 1 FROM inzendingen LIMIT 1").fetchone() is None
+
+    def zoek(self, personeelsnummer):
+        with self._slot:
+            rij = self._db.execute(
+                "SELECT data FROM inzendingen WHERE personeelsnummer = ?", (str(personeelsnummer).strip(),)
+            ).fetchone()
+        return json.loads(rij["data"]) if rij else None
+
+    def alle(self):
+        with self._slot:
+            rijen = self._db.execute("SELECT data FROM inzendingen ORDER BY rowid").fetchall()
+        return [json.loads(r["data"]) for r in rijen]
+
+    def bewaar(self, inzending):
+        # Lokaal opslaan en in dezelfde transactie in de wachtrij zetten. Per chauffeur staat er
+        # hoogstens één taak klaar: de nieuwste versie vervangt een oudere die nog niet verstuurd is.
+        # post_geprobeerd blijft staan: een eerdere POST kan upstream aangekomen zijn.
+        nummer = str(inzending["Personeelsnummer"]).strip()
+        with self._slot:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    """
+                    INSERT INTO inzendingen (personeelsnummer, data, laatste_aanpassing)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (personeelsnummer) DO UPDATE SET
+                        data = excluded.data,
+                        laatste_aanpassing = excluded.laatste_aanpassing,
+                        versie = versie + 1
+                    """,
+                    (nummer, json.dumps(inzending), inzending.get("Laatste aanpassing")),
+                )
+                versie = self._db.execute(
+                    "SELECT versie FROM inzendingen WHERE personeelsnummer = ?", (nummer,)
+                ).fetchone()["versie"]
+                self._db.execute(
+                    """
+                    INSERT INTO sync_wachtrij (personeelsnummer, versie) VALUES (?, ?)
+                    ON CONFLICT (personeelsnummer) DO UPDATE SET
+                        versie = excluded.versie, pogingen = 0, volgende_poging = 0, fout = NULL
+                    """,
+                    (nummer, versie),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return versie
+
+    def importeer(self, records):
+        # Eerste vulling vanuit SheetDB: deze rijen bestaan al upstream, dus niet in de wachtrij
+        with self._slot:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    """
+                    INSERT OR IGNORE INTO inzendingen (personeelsnummer, data, laatste_aanpassing, in_sheetdb)
+                    VALUES (?, ?, ?, 1)
+                    """,
+                    [
+                        (str(r.get("Personeelsnummer", "")).strip(), json.dumps(r), r.get("Laatste aanpassing"))
+                        for r in records
+                    ],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def stabiele_versies(self):
+        # Vóór het ophalen van SheetDB: versie per rij die op dat moment niets meer te syncen had.
+        # Enkel zulke rijen weerspiegelt de lijst die daarna binnenkomt zeker.
+        with self._slot:
+            rijen = self._db.execute(
+                """
+                SELECT personeelsnummer, versie FROM inzendingen
+                WHERE personeelsnummer NOT IN (SELECT personeelsnummer FROM sync_wachtrij)
+                """
+            ).fetchall()
+        return {r["personeelsnummer"]: r["versie"] for r in rijen}
+
+    def herlaad(self, records, stabiel):
+        # Afstemmen met SheetDB (knop "Gegevens nu verversen"): rijen die upstream gewijzigd of
+        # verwijderd zijn overnemen. records is een lijst die ná stabiele_versies() opgehaald werd;
+        # een bestaande rij wordt enkel overschreven of verwijderd als ze toen al gesynchroniseerd
+        # was en sindsdien niet meer veranderde. Wat intussen lokaal gewijzigd of door de
+        # sync-thread gepusht werd, kan in die lijst ontbreken of verouderd zijn en blijft staan.
+        upstream = {}
+        for r in records:
+            nummer = str(r.get("Personeelsnummer", "")).strip()
+            if nummer:
+                upstream[nummer] = r
+        with self._slot:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                wachtend = {r[0] for r in self._db.execute("SELECT personeelsnummer FROM sync_wachtrij")}
+                huidig = {r[0]: r[1] for r in self._db.execute("SELECT personeelsnummer, versie FROM inzendingen")}
+
+                def ongewijzigd(nummer):
+                    return nummer not in wachtend and stabiel.get(nummer) == huidig[nummer]
+
+                bij = [
+                    (nummer, json.dumps(r), r.get("Laatste aanpassing"))
+                    for nummer, r in upstream.items() if nummer not in huidig or ongewijzigd(nummer)
+                ]
+                self._db.executemany(
+                    """
+                    INSERT INTO inzendingen (personeelsnummer, data, laatste_aanpassing, in_sheetdb)
+                    VALUES (?, ?, ?, 1)
+                    ON CONFLICT (personeelsnummer) DO UPDATE SET
+                        data = excluded.data,
+                        laatste_aanpassing = excluded.laatste_aanpassing,
+                        in_sheetdb = 1
+                    """,
+                    bij,
+                )
+                # Een lege lijst upstream is eerder een storing dan "alles verwijderd"
+                weg = []
+                if upstream:
+                    lokaal = {r[0] for r in self._db.execute("SELECT personeelsnummer FROM inzendingen WHERE in_sheetdb = 1")}
+                    weg = sorted(n for n in lokaal - upstream.keys() if ongewijzigd(n))
+                    self._db.executemany("DELETE FROM inzendingen WHERE personeelsnummer = ?", [(n,) for n in weg])
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return {"ingelezen": len(bij), "verwijderd": len(weg)}
+
+    # ====== Sync-wachtrij ======
+    def klaar_voor_sync(self, limiet):
+        with self._slot:
+            rijen = self._db.execute(
+                """
+                SELECT w.personeelsnummer, w.versie, w.pogingen, w.post_geprobeerd, i.data, i.in_sheetdb
+                FROM sync_wachtrij w JOIN inzendingen i USING (personeelsnummer)
+                WHERE w.volgende_poging <= ?
+                ORDER BY w.volgende_poging
+                LIMIT ?
+                """,
+                (time.time(), limiet),
+            ).fetchall()
+        return [
+            {
+                "personeelsnummer": r["personeelsnummer"],
+                "versie": r["versie"],
+                "pogingen": r["pogingen"],
+                "data": json.loads(r["data"]),
+                "in_sheetdb": bool(r["in_sheetdb"]),
+                "post_geprobeerd": bool(r["post_geprobeerd"]),
+            }
+            for r in rijen
+        ]
+
+    def markeer_post_geprobeerd(self, personeelsnummers):
+        # Vóór de POST zetten, los van de versie: ook een nieuwere versie moet eerst zoeken
+        with self._slot:
+            self._db.executemany(
+                "UPDATE sync_wachtrij SET post_geprobeerd = 1 WHERE personeelsnummer = ?",
+                [(n,) for n in personeelsnummers],
+            )
+
+    def markeer_gesynchroniseerd(self, personeelsnummer, versie):
+        # Enkel verwijderen als er intussen geen nieuwere versie in de wachtrij kwam
+        with self._slot:
+            self._db.execute("UPDATE inzendingen SET in_sheetdb = 1 WHERE personeelsnummer = ?", (personeelsnummer,))
+            self._db.execute(
+                "DELETE FROM sync_wachtrij WHERE personeelsnummer = ? AND versie = ?", (personeelsnummer, versie)
+            )
+
+    def markeer_mislukt(self, personeelsnummer, versie, fout, wachttijd):
+        with self._slot:
+            self._db.execute(
+                """
+                UPDATE sync_wachtrij SET pogingen = pogingen + 1, volgende_poging = ?, fout = ?
+                WHERE personeelsnummer = ? AND versie = ?
+                """,
+                (time.time() + wachttijd, str(fout)[:500], personeelsnummer, versie),
+            )
+
+    def sync_status(self):
+        with self._slot:
+            rij = self._db.execute(
+                """
+                SELECT COUNT(*) AS wachtend,
+                       SUM(fout IS NOT NULL) AS met_fout,
+                       (SELECT fout FROM sync_wachtrij WHERE fout IS NOT NULL
+                        ORDER BY volgende_poging DESC LIMIT 1) AS laatste_fout
+                FROM sync_wachtrij
+                """
+            ).fetchone()
+        return {"wachtend": rij["wachtend"], "met_fout": rij["met_fout"] or 0, "laatste_fout": rij["laatste_fout"]}
@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) in seconden
+TIMEOUT = (3.05, 15)
+MAX_POGINGEN = 4
+BACKOFF_SECONDEN = 0.5
+# Alles draait op de scriptthread van Streamlit: langer wachten dan dit blokkeert een rerun
+MAX_WACHT_SECONDEN = 10
+HERPROBEER_STATUS = {429, 500, 502, 503, 504}
+IDEMPOTENT = {"GET", "PUT", "DELETE"}
+
+_sessie = None
+_sessie_slot = threading.Lock()
+
+# endpoint -> latentiestatistiek, gedeeld door alle sessies in dit proces
+_latentie = {}
+_latentie_slot = threading.Lock()
+
+
+def sessie():
+    # Eén gedeelde Session: keep-alive en connection pooling over reruns en gebruikers heen
+    global _sessie
+    with _sessie_slot:
+        if _sessie is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _sessie = s
+        return _sessie
+
+
+def _registreer(endpoint, duur, fout):
+    with _latentie_slot:
+        stat = _latentie.setdefault(
+            endpoint, {"aantal": 0, "fouten": 0, "totaal_ms": 0.0, "max_ms": 0.0, "laatste_ms": 0.0}
+        )
+        ms = duur * 1000
+        stat["aantal"] += 1
+        stat["fouten"] += int(fout)
+        stat["totaal_ms"] += ms
+        stat["max_ms"] = max(stat["max_ms"], ms)
+        stat["laatste_ms"] = ms
+
+
+def latentie_statistiek():
+    with _latentie_slot:
+        return {
+            endpoint: {**stat, "gemiddeld_ms": stat["totaal_ms"] / stat["aantal"]}
+            for endpoint, stat in _latentie.items()
+        }
+
+
+def _wachttijd(poging, response):
+    if response is not None and response.headers.get("Retry-After", "").isdigit():
+        return float(response.headers["Retry-After"])
+    return BACKOFF_SECONDEN * (2 ** poging) * (0.5 + random.random() / 2)
+
+
+def verzoek(endpoint, methode, url, **kwargs):
+    # 429 wordt altijd herhaald (verzoek niet verwerkt); 5xx en verbindingsfouten enkel voor idempotente methodes
+    kwargs.setdefault("timeout", TIMEOUT)
+    for poging in range(MAX_POGINGEN):
+        start = time.perf_counter()
+        response, fout = None, None
+        try:
+            response = sessie().request(methode, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            fout = e
+        _registreer(endpoint, time.perf_counter() - start, fout is not None or response.status_code >= 400)
+
+        laatste = poging == MAX_POGINGEN - 1
+        wacht = _wachttijd(poging, response)
+        if fout is not None:
+            if laatste or methode not in IDEMPOTENT:
+                raise fout
+        elif response.status_code in HERPROBEER_STATUS and not laatste and (
+            response.status_code == 429 or methode in IDEMPOTENT
+        ) and wacht <= MAX_WACHT_SECONDEN:
+            pass
+        else:
+            # Ook een Retry-After boven MAX_WACHT_SECONDEN: meteen falen i.p.v. de rerun op te houden
+            response.raise_for_status()
+            return response
+        time.sleep(wacht)
+
+
+class SheetDB:
+    def __init__(self, url):
+        self.url = url
+
+    def lijst(self):
+        return verzoek("lijst", "GET", self.url).json()
+
+    def zoek(self, personeelsnummer):
+        return verzoek("zoek", "GET", f"{self.url}/search", params={"Personeelsnummer": personeelsnummer}).json()
+
+    def bijwerken(self, personeelsnummer, data):
+        return verzoek("bijwerken", "PUT", f"{self.url}/Personeelsnummer/{personeelsnummer}", json={"data": data}).json()
+
+    def aanmaken(self, data):
+        return verzoek("aanmaken", "POST", self.url, json={"data": data}).json()
@@ -0,0 +1,66 @@
+import threading
+
+from sheetdb import SheetDB
+
+BATCH_GROOTTE = 25
+INTERVAL_SECONDEN = 5.0
+MAX_WACHTTIJD_SECONDEN = 300
+
+
+def _wachttijd(pogingen):
+    return min(MAX_WACHTTIJD_SECONDEN, 5 * 2 ** pogingen)
+
+
+class SyncWerker(threading.Thread):
+    # Duwt de wachtrij uit de lokale opslag in batches naar SheetDB (write-behind).
+    # Upserts zijn idempotent: bestaande rijen gaan via PUT op Personeelsnummer, nieuwe rijen in
+    # één POST per batch. Zodra voor een chauffeur een POST vertrokken is, wordt eerst gezocht
+    # (ook voor een nieuwere versie), zodat een POST die upstream toch aankwam geen dubbele rij oplevert.
+
+    def __init__(self, opslag, url):
+        super().__init__(name="sheetdb-sync", daemon=True)
+        self.opslag = opslag
+        self.sheetdb = SheetDB(url)
+        self._wekker = threading.Event()
+
+    def wek(self):
+        self._wekker.set()
+
+    def run(self):
+        while True:
+            self._wekker.wait(INTERVAL_SECONDEN)
+            self._wekker.clear()
+            try:
+                while self.verwerk() == BATCH_GROOTTE:
+                    pass
+            except Exception:
+                # Fouten per taak staan in de wachtrij; hier enkel niet laten sterven
+                continue
+
+    def verwerk(self):
+        taken = self.opslag.klaar_voor_sync(BATCH_GROOTTE)
+        aan_te_maken = []
+        for taak in taken:
+            nummer, versie = taak["personeelsnummer"], taak["versie"]
+            try:
+                bestaat = taak["in_sheetdb"]
+                if not bestaat and taak["post_geprobeerd"]:
+                    bestaat = bool(self.sheetdb.zoek(nummer))
+                if bestaat and self.sheetdb.bijwerken(nummer, taak["data"]).get("updated", 1):
+                    self.opslag.markeer_gesynchroniseerd(nummer, versie)
+                else:
+                    aan_te_maken.append(taak)
+            except Exception as e:
+                self.opslag.markeer_mislukt(nummer, versie, e, _wachttijd(taak["pogingen"]))
+
+        if aan_te_maken:
+            self.opslag.markeer_post_geprobeerd([t["personeelsnummer"] for t in aan_te_maken])
+            try:
+                self.sheetdb.aanmaken([t["data"] for t in aan_te_maken])
+            except Exception as e:
+                for taak in aan_te_maken:
+                    self.opslag.markeer_mislukt(taak["personeelsnummer"], taak["versie"], e, _wachttijd(taak["pogingen"]))
+            else:
+                for taak in aan_te_maken:
+                    self.opslag.markeer_gesynchroniseerd(taak["personeelsnummer"], taak["versie"])
+        return len(taken)
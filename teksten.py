@@ -0,0 +1,23 @@
+# Statische inhoud: één keer per proces opgebouwd, bij elke rerun enkel opnieuw getoond
+
+CSS = """
+    <style>
+    .block-container {padding-left: 1rem !important; padding-right: 1rem !important;}
+    div.stButton > button {width: 100% !important; padding: 0.75rem; font-size: 1rem;}
+    </style>
+"""
+
+UITLEG = """
+    ### ℹ️ Uitleg
+    **Om voor een dienstrol met 1 type voertuig te kunnen kiezen**, moet je over de (actieve) kwalificatie beschikken of hiervoor al ingepland zijn. Een **gemengde dienstrol** kan je wel kiezen met maar 1 kwalificatie indien je bereid bent om de andere kwalificatie te behalen.
+
+    ---
+    #### 🚏 Invulling open plaats
+    De open plaats wordt gepubliceerd voor alle chauffeurs die zich kandidaat wensen te stellen. 
+    Kandidaten worden gerangschikt volgens **stelplaatsanciënniteit**. De eerst gerangschikte neemt de open plaats in.
+
+    ---
+    #### 🔄 Invulling doorgeschoven plaats
+    Chauffeurs mogen steeds een aanvraag via mail doorsturen waarin zij hun voorkeur kenbaar maken voor een andere plaats die op dat moment nog niet open staat, maar die ze in de toekomst graag zouden innemen. 
+    Als een plaats open komt via doorschuiven omdat een chauffeur een andere plaats inneemt, wordt deze plaats **niet meer uitgehangen** maar onmiddellijk ingevuld. Hiervoor worden de aanvragen nagekeken op **stelplaatsanciënniteit**. De chauffeur met de hoogste stelplaatsanciënniteit zal deze plaats toegewezen krijgen.
+    """
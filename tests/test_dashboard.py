@@ -0,0 +1,61 @@
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dashboard import DashboardStand  # noqa: E402
+
+DIENSTEN = ["T1 - Groep 1", "T1 - Groep 2", "B7 - Groep 1", "B7 - Groep 3", "M2 - Groep 2"]
+
+
+def _record(nummer, naam, stap):
+    voorkeuren = random.sample(DIENSTEN, random.randint(1, 3))
+    return {
+        "Personeelsnummer": nummer,
+        "Naam": naam,
+        "Voorkeuren": ", ".join(voorkeuren),
+        "Bevestiging plaatsvoorkeur": "True",
+        "Ingevuld op": "2025-01-01 08:00:00",
+        "Laatste aanpassing": f"stap {stap}",
+    }
+
+
+def _vergelijk(stand, records):
+    volledig = DashboardStand()
+    volledig.bijwerken(records)
+
+    assert stand.telling == volledig.telling
+    assert stand.rijen_per_dienst == volledig.rijen_per_dienst
+    assert stand.indeling() == volledig.indeling()
+    assert sorted(stand.tabellen) == sorted(volledig.tabellen)
+    for dienst, tabel in volledig.tabellen.items():
+        pd.testing.assert_frame_equal(stand.tabellen[dienst], tabel, obj=dienst)
+
+
+def test_delta_geeft_hetzelfde_als_volledige_opbouw():
+    random.seed(7)
+    # 1005 komt twee keer voor met een andere naam, zoals een dubbele inzending in SheetDB
+    records = [_record(str(1000 + i), f"Chauffeur {i}", 0) for i in range(8)]
+    records.append(_record("1005", "Andere chauffeur", 0))
+    stand = DashboardStand()
+    stand.bijwerken(records)
+
+    volgende = 2000
+    for stap in range(1, 60):
+        actie = random.choice(["nieuw", "wijzig", "verwijder"]) if records else "nieuw"
+        if actie == "nieuw":
+            nummer = random.choice([str(volgende), records[0]["Personeelsnummer"]] if records else [str(volgende)])
+            records.insert(random.randrange(len(records) + 1), _record(nummer, f"Nieuw {volgende}", stap))
+            volgende += 1
+        elif actie == "wijzig":
+            i = random.randrange(len(records))
+            records[i] = _record(records[i]["Personeelsnummer"], records[i]["Naam"], stap)
+        else:
+            records.pop(random.randrange(len(records)))
+
+        delta = stand.bijwerken([dict(r) for r in records])
+        assert not delta.volledig
+        _vergelijk(stand, records)
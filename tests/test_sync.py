@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opslag import Opslag  # noqa: E402
+from sync import SyncWerker  # noqa: E402
+
+
+class NepSheetDB:
+    # Minimale SheetDB in het geheugen; met faal_eerste_post komt de eerste POST aan maar ziet
+    # de client een timeout
+    def __init__(self, rijen=(), faal_eerste_post=False):
+        self.rijen = [dict(r) for r in rijen]
+        self.posts = 0
+        self.faal_eerste_post = faal_eerste_post
+
+    def zoek(self, nummer):
+        return [r for r in self.rijen if r["Personeelsnummer"] == nummer]
+
+    def bijwerken(self, nummer, data):
+        geraakt = self.zoek(nummer)
+        for rij in geraakt:
+            rij.update(data)
+        return {"updated": len(geraakt)}
+
+    def aanmaken(self, data):
+        self.posts += 1
+        self.rijen.extend(dict(r) for r in data)
+        if self.faal_eerste_post and self.posts == 1:
+            raise requests.Timeout("read timed out")
+        return {"created": len(data)}
+
+
+def _inzending(voorkeuren):
+    return {"Personeelsnummer": "1001", "Naam": "Chauffeur", "Voorkeuren": voorkeuren, "Laatste aanpassing": voorkeuren}
+
+
+def test_herindienen_na_mislukte_post_maakt_geen_dubbele_rij(tmp_path):
+    opslag = Opslag(str(tmp_path / "inzendingen.db"))
+    werker = SyncWerker(opslag, "http://niet-gebruikt")
+    werker.sheetdb = NepSheetDB(faal_eerste_post=True)
+
+    opslag.bewaar(_inzending("A"))
+    werker.verwerk()                    # POST komt upstream aan, maar faalt lokaal
+    opslag.bewaar(_inzending("A, B"))   # chauffeur dient opnieuw in vóór de volgende poging
+    werker.verwerk()
+
+    assert werker.sheetdb.posts == 1
+    assert werker.sheetdb.zoek("1001") == [_inzending("A, B")]
+    assert opslag.sync_status()["wachtend"] == 0
+
+
+def test_herlaad_neemt_sheetdb_over_behalve_wachtende_wijzigingen(tmp_path):
+    opslag = Opslag(str(tmp_path / "inzendingen.db"))
+    opslag.importeer([
+        {"Personeelsnummer": "1", "Voorkeuren": "A"},
+        {"Personeelsnummer": "2", "Voorkeuren": "B"},
+        {"Personeelsnummer": "3", "Voorkeuren": "C"},
+    ])
+    opslag.bewaar({"Personeelsnummer": "3", "Voorkeuren": "C, D"})
+
+    telling = opslag.herlaad([{"Personeelsnummer": "1", "Voorkeuren": "A, E"}], opslag.stabiele_versies())
+
+    assert telling == {"ingelezen": 1, "verwijderd": 1}
+    assert opslag.zoek("1")["Voorkeuren"] == "A, E"
+    assert opslag.zoek("2") is None
+    assert opslag.zoek("3")["Voorkeuren"] == "C, D"
+
+
+def test_sync_tussen_ophalen_en_herlaad_wordt_niet_teruggedraaid(tmp_path):
+    opslag = Opslag(str(tmp_path / "inzendingen.db"))
+    oud = [{"Personeelsnummer": "1", "Voorkeuren": "A"}, {"Personeelsnummer": "2", "Voorkeuren": "B"}]
+    opslag.importeer(oud)
+    opslag.bewaar({"Personeelsnummer": "3", "Voorkeuren": "C"})
+    opslag.bewaar({"Personeelsnummer": "1", "Voorkeuren": "A, Z"})
+
+    stabiel = opslag.stabiele_versies()     # net vóór de GET van de lijst
+    werker = SyncWerker(opslag, "http://niet-gebruikt")
+    werker.sheetdb = NepSheetDB(oud)
+    werker.verwerk()                        # sync landt terwijl de GET nog loopt
+    assert opslag.sync_status()["wachtend"] == 0
+
+    opslag.herlaad(oud, stabiel)            # lijst van vóór de push
+
+    assert opslag.zoek("1")["Voorkeuren"] == "A, Z"
+    assert opslag.zoek("3")["Voorkeuren"] == "C"
+    assert opslag.zoek("2")["Voorkeuren"] == "B"
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from toewijzing import Toewijzing, ancienniteit_tabel, ancienniteit_waarde, bereken_toewijzing  # noqa: E402
+
+
+def test_doorschuiven_over_meerdere_stappen():
+    # x verlaat A voor B, y verlaat C voor de vrijgekomen A, z krijgt de vrijgekomen C
+    voorkeuren = {"x": ["B"], "y": ["A"], "z": ["C"]}
+    resultaat = bereken_toewijzing(["B"], voorkeuren, {"x": 3, "y": 2, "z": 1}, {"x": "A", "y": "C"})
+
+    assert resultaat.toewijzingen == [
+        Toewijzing("B", "x", 1, "A", False),
+        Toewijzing("A", "y", 1, "C", True),
+        Toewijzing("C", "z", 1, None, True),
+    ]
+    assert resultaat.eindplaatsen == {"x": "B", "y": "A", "z": "C"}
+    assert resultaat.onvervuld == []
+
+
+def test_zelfde_dienst_twee_keer_open():
+    voorkeuren = {"p": ["B"], "q": ["B"], "r": ["B"]}
+    resultaat = bereken_toewijzing(["B", "B"], voorkeuren, {"p": 3, "q": 2, "r": 1})
+
+    assert [(t.dienst, t.personeelsnummer) for t in resultaat.toewijzingen] == [("B", "p"), ("B", "q")]
+    assert resultaat.eindplaatsen == {"p": "B", "q": "B"}
+    assert resultaat.onvervuld == []
+
+
+def test_chauffeur_weigert_als_huidige_plaats_hoger_staat():
+    # x heeft meer anciënniteit, maar zit al op zijn eerste keuze A
+    voorkeuren = {"x": ["A", "B"], "y": ["B"]}
+    resultaat = bereken_toewijzing(["B"], voorkeuren, {"x": 10, "y": 1}, {"x": "A"})
+
+    assert resultaat.toewijzingen == [Toewijzing("B", "y", 1, None, False)]
+    assert resultaat.eindplaatsen == {"y": "B"}
+
+
+def test_open_plaats_zonder_kandidaat_blijft_onvervuld():
+    resultaat = bereken_toewijzing(["B", "C"], {"x": ["B"]}, {"x": 1})
+
+    assert resultaat.eindplaatsen == {"x": "B"}
+    assert resultaat.onvervuld == ["C"]
+
+
+@pytest.mark.parametrize("tekst", [None, "", "  ", "nan", "NaN", "inf", "-inf", "geen idee"])
+def test_ongeldige_ancienniteit_telt_niet(tekst):
+    assert ancienniteit_waarde(tekst) is None
+
+
+def test_ancienniteit_getal_en_datum():
+    assert ancienniteit_waarde("12,5") == 12.5
+    # Vroeger in dienst = meer anciënniteit
+    assert ancienniteit_waarde("01/02/1999") > ancienniteit_waarde("2005-06-30")
+
+
+def test_ontbrekende_ancienniteit_rangschikt_laatst():
+    tabel = ancienniteit_tabel({"a": "", "b": "nan", "c": "inf", "d": "3"})
+    assert tabel == {"d": 3.0}
+
+    voorkeuren = {n: ["B"] for n in "abcd"}
+    resultaat = bereken_toewijzing(["B"], voorkeuren, tabel)
+    assert resultaat.eindplaatsen == {"d": "B"}
+
+
+def test_mix_van_getallen_en_datums_wordt_geweigerd():
+    with pytest.raises(ValueError, match="getallen en datums"):
+        ancienniteit_tabel({"a": "12", "b": "01/02/1999", "c": ""})
@@ -0,0 +1,128 @@
+import heapq
+import math
+from collections import deque
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+GEEN = float("inf")
+_DATUMFORMATEN = ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d.%m.%Y")
+
+
+class Toewijzing(NamedTuple):
+    dienst: str
+    personeelsnummer: str
+    rang: int                     # plaats van de dienst in de voorkeuren van de chauffeur
+    vorige_plaats: Optional[str]  # komt hierdoor vrij als doorgeschoven plaats
+    doorgeschoven: bool           # True als deze plaats zelf vrijkwam door doorschuiven
+
+
+class Resultaat(NamedTuple):
+    toewijzingen: list      # in volgorde van de cascade
+    onvervuld: list         # plaatsen zonder kandidaat
+    eindplaatsen: dict      # personeelsnummer -> dienst, enkel voor chauffeurs die verschuiven
+
+
+def _lees_ancienniteit(tekst):
+    # -> ("getal", waarde), ("datum", waarde) of None. "nan"/"inf" zijn geen anciënniteit.
+    tekst = (tekst or "").strip()
+    if not tekst:
+        return None
+    try:
+        waarde = float(tekst.replace(",", "."))
+    except ValueError:
+        pass
+    else:
+        return ("getal", waarde) if math.isfinite(waarde) else None
+    for formaat in _DATUMFORMATEN:
+        try:
+            return "datum", -datetime.strptime(tekst, formaat).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def ancienniteit_waarde(tekst):
+    # Hogere waarde = meer anciënniteit. Getallen (jaren, punten) gelden rechtstreeks;
+    # een datum (in dienst sinds) telt omgekeerd: hoe vroeger, hoe hoger.
+    gelezen = _lees_ancienniteit(tekst)
+    return gelezen[1] if gelezen else None
+
+
+def ancienniteit_tabel(teksten):
+    # personeelsnummer -> tekst  =>  personeelsnummer -> waarde. Getallen en datums zijn niet
+    # vergelijkbaar (elke datum zou onder elk getal rangschikken), dus een mix wordt geweigerd.
+    waarden, soorten = {}, {}
+    for nummer, tekst in teksten.items():
+        gelezen = _lees_ancienniteit(tekst)
+        if gelezen is not None:
+            soorten.setdefault(gelezen[0], nummer)
+            waarden[nummer] = gelezen[1]
+    if len(soorten) > 1:
+        raise ValueError(
+            "De stelplaatsanciënniteit mengt getallen en datums (bv. personeelsnummer "
+            f"{soorten['getal']} en {soorten['datum']}); gebruik één vorm voor iedereen."
+        )
+    return waarden
+
+
+def voorkeuren_per_chauffeur(lang):
+    # lang: explodeer_voorkeuren(...) -> personeelsnummer -> diensten in voorkeursvolgorde
+    per_chauffeur = {}
+    for nummer, rang, dienst in zip(lang["Personeelsnummer"], lang["rang"], lang["dienst"]):
+        per_chauffeur.setdefault(str(nummer), []).append((rang, dienst))
+    return {nummer: [d for _, d in sorted(lijst)] for nummer, lijst in per_chauffeur.items()}
+
+
+def bereken_toewijzing(open_plaatsen, voorkeuren, ancienniteit, huidige_plaatsen=None):
+    # open_plaatsen: diensten (een dienst mag meermaals voorkomen voor meerdere plaatsen)
+    # voorkeuren: personeelsnummer -> diensten in voorkeursvolgorde
+    # ancienniteit: personeelsnummer -> getal (hoger wint); ontbrekend = laagst gerangschikt
+    # huidige_plaatsen: personeelsnummer -> dienst die de chauffeur nu inneemt
+    #
+    # Per dienst één heap met kandidaten op (-anciënniteit, personeelsnummer). Een kandidaat die
+    # een plaats weigert (hij heeft al iets beters) zal ze later ook nooit willen, want zijn
+    # plaats verbetert alleen. Elke (chauffeur, dienst) komt dus hoogstens één keer uit een heap.
+    huidige_plaatsen = huidige_plaatsen or {}
+
+    rang_van = {}
+    kandidaten = {}
+    for nummer, diensten in voorkeuren.items():
+        waarde = ancienniteit.get(nummer)
+        prioriteit = -waarde if waarde is not None else GEEN
+        rangen = {}
+        for rang, dienst in enumerate(diensten, start=1):
+            if dienst not in rangen:
+                rangen[dienst] = rang
+                kandidaten.setdefault(dienst, []).append((prioriteit, nummer))
+        rang_van[nummer] = rangen
+    for heap in kandidaten.values():
+        heapq.heapify(heap)
+
+    plaats = dict(huidige_plaatsen)
+    huidige_rang = {n: rang_van.get(n, {}).get(d, GEEN) for n, d in plaats.items()}
+
+    wachtrij = deque((dienst, False) for dienst in open_plaatsen)
+    toewijzingen, onvervuld, verschoven = [], [], set()
+    while wachtrij:
+        dienst, doorgeschoven = wachtrij.popleft()
+        heap = kandidaten.get(dienst, [])
+        gekozen = None
+        while heap:
+            _, nummer = heapq.heappop(heap)
+            if rang_van[nummer][dienst] < huidige_rang.get(nummer, GEEN):
+                gekozen = nummer
+                break
+        if gekozen is None:
+            onvervuld.append(dienst)
+            continue
+
+        vorige = plaats.get(gekozen)
+        rang = rang_van[gekozen][dienst]
+        toewijzingen.append(Toewijzing(dienst, gekozen, rang, vorige, doorgeschoven))
+        plaats[gekozen] = dienst
+        huidige_rang[gekozen] = rang
+        verschoven.add(gekozen)
+        if vorige is not None:
+            wachtrij.append((vorige, True))
+
+    return Resultaat(toewijzingen, onvervuld, {n: plaats[n] for n in verschoven})
@@ -0,0 +1,53 @@
+import hashlib
+
+import pandas as pd
+
+_VOORKEUR = r"[^,]*[^,\s][^,]*"
+
+
+# ====== Inzendingen voorbereiden ======
+def verwerk_inzendingen(df):
+    df["Voorkeuren"] = df["Voorkeuren"].fillna("")
+    df["Personeelsnummer"] = df["Personeelsnummer"].astype(str).str.strip()
+    df["Ingevuld op"] = pd.to_datetime(df["Ingevuld op"], errors="coerce")
+    # Niet-lege items tellen, zoals explodeer_voorkeuren ze parseert ("" telt als 0, niet als 1)
+    df["Aantal voorkeuren"] = df["Voorkeuren"].astype(str).str.count(_VOORKEUR).astype("int64")
+    df["Bevestigd"] = df["Bevestiging plaatsvoorkeur"].map({"True": "✅", "False": "❌"})
+    return df
+
+
+def numerieke_nummers(df):
+    # Personeelsnummer als int; rijen zonder geldig nummer vallen weg
+    df_nummers = df[["Personeelsnummer", "Naam"]].dropna()
+    df_nummers["Personeelsnummer"] = pd.to_numeric(df_nummers["Personeelsnummer"], errors="coerce")
+    df_nummers = df_nummers.dropna(subset=["Personeelsnummer"])
+    df_nummers["Personeelsnummer"] = df_nummers["Personeelsnummer"].astype(int)
+    return df_nummers
+
+
+# ====== Voorkeuren parsen ======
+def explodeer_voorkeuren(df):
+    # Eén parse-pass: één rij per (chauffeur, dienst) met de rang binnen zijn voorkeuren.
+    # De index blijft die van df, zodat elke rij terug te koppelen is aan de inzending.
+    lang = df[["Personeelsnummer", "Naam"]].copy()
+    lang["dienst"] = df["Voorkeuren"].fillna("").astype(str).str.split(",")
+    lang = lang.explode("dienst")
+    lang["dienst"] = lang["dienst"].str.strip()
+    lang = lang[lang["dienst"].notna() & (lang["dienst"] != "")]
+    lang["rang"] = lang.groupby(level=0).cumcount() + 1
+    return lang
+
+
+def dienst_index(lang):
+    # dienst -> indexlabels van de inzendingen die deze dienst als voorkeur hebben
+    return {
+        dienst: rijen.unique()
+        for dienst, rijen in lang.groupby("dienst").groups.items()
+    }
+
+
+def vingerafdruk(df):
+    # Stabiele hash van de inhoud (en kolomnamen) als sleutel voor gememoiseerde resultaten
+    h = hashlib.sha256(",".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()